@@ -7,6 +7,9 @@ from datetime import datetime
 from pathlib import Path
 import uuid
 import logging
+import threading
+from functools import partial
+from types import MappingProxyType
 from streamlit_lottie import st_lottie
 from streamlit_extras.colored_header import colored_header
 from streamlit_extras.switch_page_button import switch_page
@@ -16,155 +19,121 @@ from streamlit_extras.let_it_rain import rain
 # Import utilities
 from utils.language_utils import get_translation, get_languages_for_display
 from utils.data_utils import (
-    track_event, UserSession, memory_cache
+    track_event, memory_cache
 )
 from utils.auth_utils import user_manager
+from utils.streamlit_utils import fragment
+from utils.bootstrap import init_session_state, inject_base_css
 from config import (
-    APP_TITLE, APP_DESCRIPTION, APP_EMOJI, 
-    DEFAULT_LANGUAGE, DEFAULT_THEME, APP_INFO,
+    APP_TITLE, APP_DESCRIPTION, APP_EMOJI, APP_INFO,
     save_client_config
 )
 from components.notifications import notifications
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, 
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Configure logging (skip if the root logger was already set up, e.g. on hot-reload)
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO, 
+                       format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Sidebar navigation entries (page key, menu icon)
+NAV_PAGES = ("home", "discover", "library", "quiz", "create", "profile", "settings")
+NAV_ICONS = ("house", "search", "collection", "question-circle", "pencil-square", "person", "gear")
+
+# Theme-specific sidebar colors (read-only, shared across reruns)
+LIGHT_THEME_COLORS = MappingProxyType({
+    "sidebar_icon": "#4a4a4a",      # Darker grey
+    "sidebar_text": "#333333",      # Dark grey
+    "sidebar_hover_bg": "#e6e6e6",  # Lighter grey for hover
+    "sidebar_selected_bg": "#1DB954",# Accent green for selected
+    "sidebar_selected_text": "#ffffff" # White text for selected
+})
+DARK_THEME_COLORS = MappingProxyType({
+    "sidebar_icon": "#b0b0b0",      # Softer white/light grey
+    "sidebar_text": "#d0d0d0",      # Light grey
+    "sidebar_hover_bg": "#33373d",  # Darker grey for hover
+    "sidebar_selected_bg": "#1DB954",# Accent green for selected
+    "sidebar_selected_text": "#ffffff" # White text for selected
+})
+
+# Landing page content
+SAMPLE_TOPICS = (
+    "Quantum Computing Basics",
+    "The Renaissance Period",
+    "Artificial Intelligence Ethics", 
+    "Contemporary Art Movements",
+    "Mindfulness and Meditation",
+    "Sustainable Urban Planning"
+)
+
+RECENT_UPDATES = (
+    {"title": "Offline Mode", "description": "Download content for offline learning"},
+    {"title": "New Languages", "description": "Added support for Portuguese, Russian, and Korean"},
+    {"title": "Learning Paths", "description": "Follow curated learning journeys on various topics"}
+)
+
+@st.cache_resource(show_spinner=False)
+def _load_lottie(path: str) -> dict:
+    """Parse a Lottie animation once and share it across reruns and sessions"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _warm_up_llm_client():
+    """Import the LLM utilities and pre-open their client connection (background thread)"""
+    from utils.llm_utils import warm_up_connections
+    warm_up_connections()
+
+def _on_language_change():
+    """Apply the sidebar language choice before the triggered rerun starts"""
+    st.session_state.language = st.session_state.language_selector
+
+def _on_theme_change():
+    """Apply the sidebar theme choice before the triggered rerun starts"""
+    st.session_state.theme = st.session_state.theme_selector
+
 class MindsnacksApp:
     """Main application class for Mindsnacks v2"""
     
     def __init__(self):
-        """Initialize application"""
-        # Set page configuration
+        """Initialize application (once per server process, see get_app)"""
+        self._bootstrap()
+    
+    def _bootstrap(self):
+        """One-shot setup that does not depend on per-session state"""
+        # Save client-side configuration
+        save_client_config()
+        
+        # Open the LLM connection before the first user request needs it,
+        # off the script thread so the first render isn't delayed
+        threading.Thread(target=_warm_up_llm_client, name="llm-warm-up", daemon=True).start()
+    
+    def _configure_page(self):
+        """Set page configuration (must be the first Streamlit call of each run)"""
         st.set_page_config(
             page_title=APP_TITLE,
             page_icon=APP_EMOJI,
             layout="wide",
             initial_sidebar_state="expanded"
         )
-        
-        # Save client-side configuration
-        save_client_config()
-        
-        # Initialize session state
-        self._init_session_state()
-        
-        # Apply custom styling
-        self._apply_custom_styling()
-    
-    def _init_session_state(self):
-        """Initialize session state variables"""
-        # Language setting
-        if 'language' not in st.session_state:
-            st.session_state.language = DEFAULT_LANGUAGE
-        
-        # Theme setting
-        if 'theme' not in st.session_state:
-            st.session_state.theme = DEFAULT_THEME
-            
-        # User session
-        if 'session' not in st.session_state:
-            st.session_state.session = UserSession()
-        
-        # Current page
-        if 'current_page' not in st.session_state:
-            st.session_state.current_page = 'home'
-        
-        # Playlist
-        if 'current_playlist' not in st.session_state:
-            st.session_state.current_playlist = []
     
     def _apply_custom_styling(self):
         """Apply custom CSS styling and define theme-specific colors"""
         theme = st.session_state.theme
         
         if theme == 'light':
-            st.session_state.theme_colors = {
-                "sidebar_icon": "#4a4a4a",      # Darker grey
-                "sidebar_text": "#333333",      # Dark grey
-                "sidebar_hover_bg": "#e6e6e6",  # Lighter grey for hover
-                "sidebar_selected_bg": "#1DB954",# Accent green for selected
-                "sidebar_selected_text": "#ffffff" # White text for selected
-            }
-            theme_css_path = Path('static/css/light.css')
+            st.session_state.theme_colors = LIGHT_THEME_COLORS
         else: # Dark theme
-            st.session_state.theme_colors = {
-                "sidebar_icon": "#b0b0b0",      # Softer white/light grey
-                "sidebar_text": "#d0d0d0",      # Light grey
-                "sidebar_hover_bg": "#33373d",  # Darker grey for hover
-                "sidebar_selected_bg": "#1DB954",# Accent green for selected
-                "sidebar_selected_text": "#ffffff" # White text for selected
-            }
-            theme_css_path = Path('static/css/dark.css')
-            
-        # Default to dark theme if file doesn't exist
-        if not theme_css_path.exists() and theme == 'dark': # Ensure this only runs for dark theme if dark.css is missing
-            # Create a basic dark.css if it's missing
-            os.makedirs(Path('static/css'), exist_ok=True) # Ensure directory exists
-            with open('static/css/dark.css', 'w') as f:
-                f.write("""
-                /* Dark theme CSS */
-                .stApp {
-                    background-color: #121212;
-                    color: #f0f0f0;
-                }
-                .stButton button {
-                    background-color: #1DB954;
-                    color: white;
-                    border-radius: 20px;
-                }
-                .stButton button:hover {
-                    background-color: #1ED760;
-                }
-                .sidebar .sidebar-content {
-                    background-color: #121212;
-                }
-                /* Add more styles as needed */
-                """)
-        
-        # Apply common CSS
-        st.markdown("""
-        <style>
-        /* Common CSS for both themes */
-        .stApp {
-            font-family: 'Roboto', sans-serif;
-        }
-        .stButton button {
-            border-radius: 20px;
-            padding: 0.3rem 1rem;
-            font-weight: 500;
-        }
-        .sidebar .sidebar-content {
-            padding: 1rem;
-        }
-        /* Logo styling */
-        .app-logo {
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            margin-bottom: 1rem;
-        }
-        .app-logo img {
-            max-width: 150px;
-        }
-        /* Cards */
-        .st-card {
-            border-radius: 10px;
-            padding: 1.5rem;
-            margin-bottom: 1rem;
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        }
-        </style>
-        """, unsafe_allow_html=True)
+            st.session_state.theme_colors = DARK_THEME_COLORS
         
-        # Apply theme-specific CSS if file exists
-        if theme_css_path.exists():
-            with open(theme_css_path) as f:
-                st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+        # Apply base + theme CSS in one element
+        inject_base_css(theme)
     
     def render_sidebar(self):
         """Render sidebar with navigation"""
+        # Bind the current language once for all translated labels
+        language = st.session_state.language
+        t = partial(get_translation, language=language)
+        
         with st.sidebar:
             # App title/logo
             st.markdown(f"<h1 style='text-align: center;'>{APP_EMOJI} {APP_TITLE}</h1>", unsafe_allow_html=True)
@@ -172,21 +141,14 @@ class MindsnacksApp:
             # Display user info if logged in
             if st.session_state.session.is_authenticated:
                 user = st.session_state.session.get_user() # Assuming get_user() is a method that returns a dict-like object
-                st.markdown(f"### {get_translation('welcome', st.session_state.language)}, {user.get('username', 'User')}")
+                st.markdown(f"### {t('welcome')}, {user.get('username', 'User')}")
             
             # Navigation menu
+            nav_labels = [t(page) for page in NAV_PAGES]
             selected = option_menu(
                 menu_title=None,
-                options=[
-                    get_translation("home", st.session_state.language),
-                    get_translation("discover", st.session_state.language),
-                    get_translation("library", st.session_state.language),
-                    get_translation("quiz", st.session_state.language),
-                    get_translation("create", st.session_state.language),
-                    get_translation("profile", st.session_state.language),
-                    get_translation("settings", st.session_state.language),
-                ],
-                icons=["house", "search", "collection", "question-circle", "pencil-square", "person", "gear"],
+                options=nav_labels,
+                icons=list(NAV_ICONS),
                 menu_icon="cast",
                 default_index=0,
                 orientation="vertical",
@@ -210,52 +172,39 @@ class MindsnacksApp:
                 }
             )
             
-            # Handle navigation
-            if selected == get_translation("home", st.session_state.language):
+            # Handle navigation by position, not by comparing translated strings
+            page = NAV_PAGES[nav_labels.index(selected)] if selected in nav_labels else "home"
+            if page == "home":
                 st.session_state.current_page = "home"
-            elif selected == get_translation("discover", st.session_state.language):
-                switch_page("discover")
-            elif selected == get_translation("library", st.session_state.language):
-                switch_page("library") 
-            elif selected == get_translation("quiz", st.session_state.language):
-                switch_page("quiz")
-            elif selected == get_translation("create", st.session_state.language):
-                switch_page("create")
-            elif selected == get_translation("profile", st.session_state.language):
-                switch_page("profile")
-            elif selected == get_translation("settings", st.session_state.language):
-                switch_page("settings")
+            else:
+                switch_page(page)
             
             # Language selector
             st.divider()
             languages = get_languages_for_display()
+            lang_keys = list(languages)
             col1, col2 = st.columns(2)
             with col1:
-                selected_language = st.selectbox(
-                    get_translation("language_settings", st.session_state.language),
-                    options=list(languages.keys()),
-                    format_func=lambda x: languages[x],
-                    index=list(languages.keys()).index(st.session_state.language),
-                    key="language_selector"
+                st.selectbox(
+                    t("language_settings"),
+                    options=lang_keys,
+                    format_func=languages.__getitem__,
+                    index=lang_keys.index(language),
+                    key="language_selector",
+                    on_change=_on_language_change
                 )
-                
-                if selected_language != st.session_state.language:
-                    st.session_state.language = selected_language
-                    st.rerun()
             
             # Theme selector
             with col2:
-                selected_theme = st.selectbox(
-                    get_translation("theme", st.session_state.language),
-                    options=["dark", "light"],
-                    format_func=lambda x: get_translation(f"{x}_mode", st.session_state.language),
+                theme_labels = {"dark": t("dark_mode"), "light": t("light_mode")}
+                st.selectbox(
+                    t("theme"),
+                    options=list(theme_labels),
+                    format_func=theme_labels.__getitem__,
                     index=0 if st.session_state.theme == "dark" else 1,
-                    key="theme_selector"
+                    key="theme_selector",
+                    on_change=_on_theme_change
                 )
-                
-                if selected_theme != st.session_state.theme:
-                    st.session_state.theme = selected_theme
-                    st.rerun()
             
             # App version at the bottom
             st.divider()
@@ -272,14 +221,13 @@ class MindsnacksApp:
         
         # Try to load animation
         try:
-            with open('static/img/animations/welcome.json', 'r') as f:
-                lottie_data = json.load(f)
+            lottie_data = _load_lottie('static/img/animations/welcome.json')
             
             # Display animation
             col1, col2, col3 = st.columns([1, 3, 1])
             with col2:
                 st_lottie(lottie_data, height=300, key="welcome_animation")
-        except:
+        except (FileNotFoundError, json.JSONDecodeError):
             # Fallback if animation file doesn't exist
             logo_url = "https://img.icons8.com/color/240/000000/headphones--v2.png"
             st.image(logo_url, width=150)
@@ -298,68 +246,71 @@ class MindsnacksApp:
         - **Track** your learning journey
         """)
         
+        # Sample topics and "What's New" are static content
+        self._render_static_landing_sections()
+        
+        # Easter egg - achievement notification on 10% of sessions (rolled once per session)
+        if 'curious_mind_checked' not in st.session_state:
+            st.session_state.curious_mind_checked = True
+            if random.random() < 0.1:
+                notifications.add_success(
+                    "You've unlocked the 'Curious Mind' achievement!",
+                    title="Achievement Unlocked"
+                )
+                rain(
+                    emoji="🎉",
+                    font_size=54,
+                    falling_speed=5,
+                    animation_length=1,
+                )
+    
+    @fragment
+    def _render_static_landing_sections(self):
+        """Render sample topics and recent updates (reruns independently of the page)"""
         # Show sample topics
         st.divider()
         st.markdown("## Sample Topics to Explore")
         
-        sample_topics = [
-            "Quantum Computing Basics",
-            "The Renaissance Period",
-            "Artificial Intelligence Ethics", 
-            "Contemporary Art Movements",
-            "Mindfulness and Meditation",
-            "Sustainable Urban Planning"
-        ]
-        
-        # Display topics in a grid
+        # Display topics in a grid: one markdown element per column for the
+        # cards, followed by that column's Explore buttons
+        explore_label = get_translation("explore", st.session_state.language)
         cols = st.columns(3)
-        for i, topic in enumerate(sample_topics):
-            with cols[i % 3]:
-                st.markdown(f"""
+        for col_index, col in enumerate(cols):
+            column_topics = list(enumerate(SAMPLE_TOPICS))[col_index::3]
+            with col:
+                st.markdown("".join(f"""
                 <div style='background-color: #282828; border-radius: 10px; padding: 15px; 
                     margin-bottom: 15px; border-left: 5px solid #1DB954;'>
                     <h3 style='margin-top: 0;'>{topic}</h3>
                 </div>
-                """, unsafe_allow_html=True)
+                """ for _, topic in column_topics), unsafe_allow_html=True)
                 
-                if st.button(get_translation("explore", st.session_state.language), key=f"explore_{i}"):
-                    # Set the topic in session state and navigate to Discover page
-                    st.session_state.explore_topic = topic
-                    switch_page("discover")
+                for i, topic in column_topics:
+                    if st.button(f"{explore_label}: {topic}", key=f"explore_{i}"):
+                        # Set the topic in session state and navigate to Discover page
+                        st.session_state.explore_topic = topic
+                        switch_page("discover")
         
         # Recent updates section
         st.divider()
         st.markdown("## What's New")
         
-        updates = [
-            {"title": "Offline Mode", "description": "Download content for offline learning"},
-            {"title": "New Languages", "description": "Added support for Portuguese, Russian, and Korean"},
-            {"title": "Learning Paths", "description": "Follow curated learning journeys on various topics"}
-        ]
-        
-        for update in updates:
-            st.markdown(f"""
+        # Emit all update cards in a single markdown element
+        updates_html = "\n".join(f"""
             <div style='background-color: #1E1E1E; border-radius: 10px; padding: 10px; margin-bottom: 10px;'>
                 <h4 style='margin-top: 0;'>{update['title']}</h4>
                 <p>{update['description']}</p>
             </div>
-            """, unsafe_allow_html=True)
-        
-        # Easter egg - achievement notification on 10% of visits
-        if random.random() < 0.1:
-            notifications.add_success(
-                "You've unlocked the 'Curious Mind' achievement!",
-                title="Achievement Unlocked"
-            )
-            rain(
-                emoji="🎉",
-                font_size=54,
-                falling_speed=5,
-                animation_length=1,
-            )
+            """ for update in RECENT_UPDATES)
+        st.markdown(updates_html, unsafe_allow_html=True)
     
     def run(self):
         """Run the application"""
+        # Per-run setup: page config, session state and theme styling
+        self._configure_page()
+        init_session_state()
+        self._apply_custom_styling()
+        
         # Track page view for analytics
         track_event("page_view", {"page": "home"})
         
@@ -373,7 +324,11 @@ class MindsnacksApp:
         # Handle notifications (this will display any queued notifications)
         notifications.render_notification_center()
 
+@st.cache_resource(show_spinner=False)
+def get_app() -> MindsnacksApp:
+    """Return the shared application instance, constructed once per process"""
+    return MindsnacksApp()
+
 # Initialize and run the app
 if __name__ == "__main__":
-    app = MindsnacksApp()
-    app.run()
\ No newline at end of file
+    get_app().run()
\ No newline at end of file
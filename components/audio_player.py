@@ -1,10 +1,51 @@
 import streamlit as st
-import streamlit_player as st_player
 import os
 import time
-import base64
+import random
+import numpy as np
 from typing import Optional, Callable, Dict, Any
 from utils.audio_utils import get_audio_duration, generate_waveform_data
+from utils.streamlit_utils import fragment
+
+# Waveform visualization settings
+WAVEFORM_POINTS = 100
+WAVEFORM_WIDTH = 600
+WAVEFORM_HEIGHT = 60
+WAVEFORM_BGCOLOR = "#1E1E1E"
+WAVEFORM_COLOR = "#1DB954"
+
+# Shared by all playlist players; PlaylistPlayer is rebuilt on every rerun,
+# so a per-instance Random would reseed from os.urandom each time
+_shuffle_rng = random.Random()
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _waveform_svg(path: str, mtime: float) -> str:
+    """Build the waveform SVG for an audio file once per (path, mtime)"""
+    amplitudes = np.asarray(generate_waveform_data(path, num_points=WAVEFORM_POINTS), dtype=np.float32)
+    if not amplitudes.size:
+        return ""
+    
+    # Bars extend from the center line both up and down, one stroke per bar
+    bar_width = max(1, WAVEFORM_WIDTH / amplitudes.size - 1)
+    xs = np.arange(amplitudes.size) * (bar_width + 1) + bar_width / 2
+    heights = amplitudes * (WAVEFORM_HEIGHT / 2)
+    path_data = " ".join(f"M{x:.1f},{-h:.1f}V{h:.1f}" for x, h in zip(xs.tolist(), heights.tolist()))
+    
+    return f"""
+    <svg width="{WAVEFORM_WIDTH}" height="{WAVEFORM_HEIGHT}" style="background-color: {WAVEFORM_BGCOLOR}; border-radius: 4px;">
+        <g transform="translate(0, {WAVEFORM_HEIGHT/2})">
+            <path d="{path_data}" stroke="{WAVEFORM_COLOR}" stroke-width="{bar_width:.1f}" fill="none" />
+        </g>
+    </svg>
+    """
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _file_to_data_url(path: str, mtime: float) -> str:
+    """Read and base64-encode an audio file once per (path, mtime)"""
+    import base64
+    
+    with open(path, "rb") as f:
+        return f"data:audio/mp3;base64,{base64.b64encode(f.read()).decode()}"
 
 class AudioPlayer:
     """Enhanced audio player component with visualization and controls"""
@@ -18,7 +59,6 @@ class AudioPlayer:
         """
         self.key_prefix = key_prefix
         self.current_audio = None
-        self.waveform_data = None
         self.is_playing = False
         self.progress = 0
         self.duration = 0
@@ -26,7 +66,8 @@ class AudioPlayer:
         self.playback_rate = 1.0
     
     def render(self, audio_path: str, title: str = None, autoplay: bool = False, 
-               on_complete: Optional[Callable] = None, show_download: bool = True):
+               on_complete: Optional[Callable] = None, show_download: bool = True,
+               duration: Optional[float] = None):
         """
         Render the audio player
         
@@ -36,6 +77,8 @@ class AudioPlayer:
             autoplay (bool): Whether to autoplay the audio
             on_complete (callable, optional): Function to call when audio finishes
             show_download (bool): Whether to show download button
+            duration (float, optional): Known duration (e.g. snippet['audio_duration']);
+                probed from the file if omitted
         """
         if not audio_path or not os.path.exists(audio_path):
             st.warning("Audio file not found.")
@@ -43,8 +86,7 @@ class AudioPlayer:
         
         # Get audio information
         self.current_audio = audio_path
-        self.duration = get_audio_duration(audio_path)
-        self.waveform_data = generate_waveform_data(audio_path, num_points=100)
+        self.duration = duration if duration is not None else get_audio_duration(audio_path)
         
         # Container for player
         player_container = st.container()
@@ -58,8 +100,11 @@ class AudioPlayer:
             col1, col2 = st.columns([8, 2])
             
             with col1:
-                # Use streamlit_player for playback
-                file_url = f"data:audio/mp3;base64,{self._get_file_as_base64(audio_path)}"
+                # Use streamlit_player for playback (imported on first render,
+                # so pages that only import AudioPlayer don't load it)
+                import streamlit_player as st_player
+                
+                file_url = self._get_file_data_url(audio_path)
                 
                 st_player.st_player(
                     url=file_url,
@@ -71,7 +116,7 @@ class AudioPlayer:
                 )
                 
                 # Display waveform
-                self._render_waveform()
+                self._render_waveform(audio_path)
             
             with col2:
                 # Control buttons
@@ -99,63 +144,31 @@ class AudioPlayer:
                 
         return True
     
-    def _render_waveform(self):
+    def _render_waveform(self, audio_path: str):
         """Render waveform visualization"""
-        if not self.waveform_data:
+        try:
+            svg = _waveform_svg(audio_path, os.path.getmtime(audio_path))
+        except OSError:
             return
         
-        # Create SVG waveform visualization
-        width = 600
-        height = 60
-        bgcolor = "#1E1E1E"
-        color = "#1DB954"
-        
-        svg = f"""
-        <svg width="{width}" height="{height}" style="background-color: {bgcolor}; border-radius: 4px;">
-            <g transform="translate(0, {height/2})">
-        """
-        
-        # Calculate bar width
-        bar_width = max(1, width / len(self.waveform_data) - 1)
-        
-        # Draw bars
-        for i, amplitude in enumerate(self.waveform_data):
-            # Scale amplitude to half the height
-            bar_height = amplitude * (height / 2)
-            
-            # Calculate x position
-            x = i * (bar_width + 1)
-            
-            # Draw bar (from center, extending both up and down)
-            svg += f'<rect x="{x}" y="{-bar_height}" width="{bar_width}" height="{bar_height*2}" fill="{color}" />'
-        
-        svg += """
-            </g>
-        </svg>
-        """
-        
         # Display waveform
-        st.markdown(svg, unsafe_allow_html=True)
+        if svg:
+            st.markdown(svg, unsafe_allow_html=True)
     
     def _render_download_button(self, audio_path: str):
         """Render a download button for the audio file"""
-        try:
-            with open(audio_path, "rb") as file:
-                audio_bytes = file.read()
-                file_name = os.path.basename(audio_path)
-                
-                b64 = base64.b64encode(audio_bytes).decode()
-                href = f'<a href="data:audio/mp3;base64,{b64}" download="{file_name}" style="text-decoration:none;">⬇️ Download</a>'
-                st.markdown(href, unsafe_allow_html=True)
-        except Exception as e:
-            st.error(f"Error creating download button: {e}")
+        file_url = self._get_file_data_url(audio_path)
+        if not file_url:
+            return
+        
+        file_name = os.path.basename(audio_path)
+        href = f'<a href="{file_url}" download="{file_name}" style="text-decoration:none;">⬇️ Download</a>'
+        st.markdown(href, unsafe_allow_html=True)
     
-    def _get_file_as_base64(self, file_path: str) -> str:
-        """Convert file to base64 encoding"""
+    def _get_file_data_url(self, file_path: str) -> str:
+        """Get the file as a base64 data URL (cached across reruns and players)"""
         try:
-            with open(file_path, "rb") as f:
-                data = f.read()
-                return base64.b64encode(data).decode()
+            return _file_to_data_url(file_path, os.path.getmtime(file_path))
         except Exception as e:
             st.error(f"Error encoding file: {e}")
             return ""
@@ -197,6 +210,11 @@ class PlaylistPlayer:
             st.info("No tracks in playlist.")
             return
         
+        self._render_player(autoplay, show_playlist)
+    
+    @fragment
+    def _render_player(self, autoplay: bool, show_playlist: bool):
+        """Render player, controls and track list (reruns on its own as a fragment)"""
         # Initialize session state for playlist if needed
         if f"{self.key_prefix}_current_index" not in st.session_state:
             st.session_state[f"{self.key_prefix}_current_index"] = 0
@@ -220,24 +238,26 @@ class PlaylistPlayer:
             audio_path=current_track.get('audio_path', ''),
             title=None,  # Title already displayed above
             autoplay=autoplay,
-            on_complete=self._play_next_track
+            on_complete=self._play_next_track,
+            duration=current_track.get('audio_duration')
         )
         
         # Player controls
         col1, col2, col3 = st.columns([1, 1, 1])
         
+        # Controls update state in on_click callbacks, which run before the
+        # rerun the click triggers, so no explicit st.rerun() is needed
         with col1:
-            if st.button("⏮️ Previous", key=f"{self.key_prefix}_prev", disabled=current_index <= 0):
-                self._play_previous_track()
+            st.button("⏮️ Previous", key=f"{self.key_prefix}_prev", disabled=current_index <= 0,
+                      on_click=self._play_previous_track)
         
         with col2:
             # Shuffle button
-            if st.button("🔀 Shuffle", key=f"{self.key_prefix}_shuffle"):
-                self._shuffle_playlist()
+            st.button("🔀 Shuffle", key=f"{self.key_prefix}_shuffle", on_click=self._shuffle_playlist)
         
         with col3:
-            if st.button("⏭️ Next", key=f"{self.key_prefix}_next", disabled=current_index >= len(self.playlist) - 1):
-                self._play_next_track()
+            st.button("⏭️ Next", key=f"{self.key_prefix}_next", disabled=current_index >= len(self.playlist) - 1,
+                      on_click=self._play_next_track)
         
         # Display playlist
         if show_playlist and len(self.playlist) > 1:
@@ -263,45 +283,40 @@ class PlaylistPlayer:
                     st.markdown(f"{i+1}. {title}")
             
             with col2:
-                if not is_current and st.button("Play", key=f"{self.key_prefix}_play_{i}"):
-                    st.session_state[f"{self.key_prefix}_current_index"] = i
-                    st.rerun()
+                if not is_current:
+                    st.button("Play", key=f"{self.key_prefix}_play_{i}", on_click=self._select_track, args=(i,))
+    
+    def _select_track(self, index: int):
+        """Make the track at index the current track"""
+        st.session_state[f"{self.key_prefix}_current_index"] = index
     
     def _play_next_track(self):
         """Play the next track in the playlist"""
         current_index = st.session_state.get(f"{self.key_prefix}_current_index", 0)
         if current_index < len(self.playlist) - 1:
             st.session_state[f"{self.key_prefix}_current_index"] = current_index + 1
-            st.rerun()
     
     def _play_previous_track(self):
         """Play the previous track in the playlist"""
         current_index = st.session_state.get(f"{self.key_prefix}_current_index", 0)
         if current_index > 0:
             st.session_state[f"{self.key_prefix}_current_index"] = current_index - 1
-            st.rerun()
     
     def _shuffle_playlist(self):
-        """Shuffle the playlist"""
-        import random
+        """Shuffle the playlist in place, keeping the current track first"""
+        n = len(self.playlist)
+        if n <= 1:
+            return
         
-        # Save current track
+        # Move the current track to the front with a swap (no O(n) pop/insert)
         current_index = st.session_state.get(f"{self.key_prefix}_current_index", 0)
-        current_track = self.playlist[current_index] if self.playlist else None
+        playlist = self.playlist
+        playlist[0], playlist[current_index] = playlist[current_index], playlist[0]
         
-        # Shuffle playlist
-        if len(self.playlist) > 1:
-            # Remove current track
-            if current_track:
-                self.playlist.pop(current_index)
-            
-            # Shuffle remaining tracks
-            random.shuffle(self.playlist)
-            
-            # Add current track back at the beginning
-            if current_track:
-                self.playlist.insert(0, current_track)
-            
-            # Reset index
-            st.session_state[f"{self.key_prefix}_current_index"] = 0
-            st.rerun()
\ No newline at end of file
+        # Fisher-Yates over the remaining tracks (indices 1..n-1)
+        for i in range(n - 1, 1, -1):
+            j = _shuffle_rng.randint(1, i)
+            playlist[i], playlist[j] = playlist[j], playlist[i]
+        
+        # Reset index
+        st.session_state[f"{self.key_prefix}_current_index"] = 0
@@ -1,6 +1,57 @@
+import functools
+from types import MappingProxyType
 import streamlit as st
 from typing import Dict, List, Any, Optional, Callable, Union
-import random
+from jinja2 import BaseLoader, Environment
+
+# Card markup is compiled once at import; autoescape keeps user text inert
+_ENV = Environment(loader=BaseLoader(), autoescape=True, cache_size=-1)
+
+TOPIC_CARD_TMPL = _ENV.from_string("""
+<div class="topic-card" id="{{ key }}">
+    <h3>{{ topic }}</h3>{% if description %}<p>{{ description }}</p>{% endif %}
+</div>
+""")
+
+ACHIEVEMENT_CARD_TMPL = _ENV.from_string("""
+<div class="achievement-card{{ ' completed' if is_completed else '' }}">
+    <div>
+        <h3>{{ name }}</h3>
+        <p>{{ description }}</p>
+    </div>
+    <div class="achievement-badge">
+        <div class="achievement-points">{{ points }}</div>
+        <div class="achievement-status">{{ "Completed" if is_completed else "Locked" }}</div>
+    </div>
+</div>
+""")
+
+@functools.lru_cache(maxsize=1024)
+def _format_duration(seconds: int) -> str:
+    """Format a duration in seconds as m:ss (or a placeholder when unknown)"""
+    if not seconds:
+        return "—:—"
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+@functools.lru_cache(maxsize=256)
+def _option_labels(option_items: tuple) -> MappingProxyType:
+    """Map each quiz option key to its "key: text" radio label (read-only)"""
+    return MappingProxyType({key: f"{key}: {text}" for key, text in option_items})
+
+def _card_key(key_prefix: str, *identity) -> str:
+    """
+    Build a widget key that is stable across reruns for the same card
+    
+    Cards showing identical content on one page need distinct key_prefix values.
+    
+    Args:
+        key_prefix (str): Prefix for component keys
+        *identity: Values that identify the card's content
+        
+    Returns:
+        str: Widget key
+    """
+    return f"{key_prefix}_{hash(identity) & 0xFFFFFFFF:08x}"
 
 def render_topic_card(topic: str, 
                     description: Optional[str] = None, 
@@ -17,45 +68,13 @@ def render_topic_card(topic: str,
         on_click (callable, optional): Function to call when card is clicked
         key_prefix (str): Prefix for component keys
     """
-    # Generate random key suffix for uniqueness
-    key = f"{key_prefix}_{random.randint(1000, 9999)}"
-    
-    # Define card style
-    card_style = """
-    <style>
-    .topic-card {
-        background-color: #282828;
-        border-radius: 10px;
-        padding: 15px;
-        margin-bottom: 15px;
-        border-left: 5px solid #1DB954;
-        transition: transform 0.3s ease, box-shadow 0.3s ease;
-    }
-    .topic-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 10px 15px rgba(0, 0, 0, 0.2);
-    }
-    .topic-card h3 {
-        margin-top: 0;
-        color: white;
-    }
-    .topic-card p {
-        color: #cccccc;
-        font-size: 0.9rem;
-    }
-    </style>
-    """
+    # Content-derived key so widgets keep their identity across reruns
+    key = _card_key(key_prefix, topic, description)
     
     # Card HTML
-    card_html = f"""
-    <div class="topic-card" id="{key}">
-        <h3>{topic}</h3>
-        {"" if not description else f"<p>{description}</p>"}
-    </div>
-    """
+    card_html = TOPIC_CARD_TMPL.render(key=key, topic=topic, description=description)
     
-    # Render card
-    st.markdown(card_style, unsafe_allow_html=True)
+    # Render card (styles come from static/css/cards.css)
     st.markdown(card_html, unsafe_allow_html=True)
     
     # Handle click if callback provided
@@ -79,8 +98,8 @@ def render_snippet_card(snippet: Dict[str, Any],
         show_quiz_button (bool): Whether to show the quiz button
         key_prefix (str): Prefix for component keys
     """
-    # Generate random key suffix for uniqueness
-    key = f"{key_prefix}_{random.randint(1000, 9999)}"
+    # Content-derived key so widgets keep their identity across reruns
+    key = _card_key(key_prefix, snippet.get('title'), snippet.get('audio_path'))
     
     # Extract snippet data
     title = snippet.get('title', 'Untitled Snippet')
@@ -89,12 +108,7 @@ def render_snippet_card(snippet: Dict[str, Any],
     language = snippet.get('language', 'en')
     
     # Format duration
-    if duration:
-        duration_min = int(duration // 60)
-        duration_sec = int(duration % 60)
-        duration_str = f"{duration_min}:{duration_sec:02d}"
-    else:
-        duration_str = "—:—"
+    duration_str = _format_duration(int(duration or 0))
     
     # Card container
     with st.container():
@@ -134,8 +148,8 @@ def render_quiz_card(question: Dict[str, Any],
         show_answer (bool): Whether to show the correct answer
         key_prefix (str): Prefix for component keys
     """
-    # Generate random key suffix for uniqueness
-    key = f"{key_prefix}_{random.randint(1000, 9999)}"
+    # Content-derived key so widgets keep their identity across reruns
+    key = _card_key(key_prefix, question.get('question'), tuple(question.get('options', {})))
     
     # Extract question data
     question_text = question.get('question', 'No question text')
@@ -149,10 +163,11 @@ def render_quiz_card(question: Dict[str, Any],
         st.markdown(f"### {question_text}")
         
         # Options as radio buttons
+        labels = _option_labels(tuple(options.items()))
         selected_option = st.radio(
             "Select your answer:",
-            options.keys(),
-            format_func=lambda x: f"{x}: {options.get(x, '')}",
+            list(labels),
+            format_func=labels.__getitem__,
             key=f"{key}_options"
         )
         
@@ -187,17 +202,17 @@ def render_playlist_card(playlist: Dict[str, Any],
         on_view (callable, optional): Function to call when view button is clicked
         key_prefix (str): Prefix for component keys
     """
-    # Generate random key suffix for uniqueness
-    key = f"{key_prefix}_{random.randint(1000, 9999)}"
+    # Content-derived key so widgets keep their identity across reruns
+    key = _card_key(key_prefix, playlist.get('id'), playlist.get('name'))
     
     # Extract playlist data
     name = playlist.get('name', 'Untitled Playlist')
     description = playlist.get('description', '')
     snippets = playlist.get('snippets', [])
     
-    # Calculate total duration
-    total_duration = sum(snippet.get('audio_duration', 0) for snippet in snippets)
-    total_duration_min = int(total_duration // 60)
+    # Calculate track count and total duration
+    durations = [snippet.get('audio_duration') or 0 for snippet in snippets]
+    track_count, total_duration_min = len(durations), int(sum(durations) // 60)
     
     # Card container
     with st.container():
@@ -207,7 +222,7 @@ def render_playlist_card(playlist: Dict[str, Any],
             st.markdown(f"### {name}")
             if description:
                 st.markdown(description)
-            st.markdown(f"**Tracks:** {len(snippets)} | **Duration:** {total_duration_min} min")
+            st.markdown(f"**Tracks:** {track_count} | **Duration:** {total_duration_min} min")
         
         with col2:
             # Play button
@@ -238,36 +253,20 @@ def render_achievement_card(achievement: Dict[str, Any],
         is_completed (bool): Whether the achievement is completed
         key_prefix (str): Prefix for component keys
     """
-    # Generate random key suffix for uniqueness
-    key = f"{key_prefix}_{random.randint(1000, 9999)}"
-    
     # Extract achievement data
     name = achievement.get('name', 'Untitled Achievement')
     description = achievement.get('description', '')
     points = achievement.get('points', 0)
     
-    # Define card style based on completion status
-    border_color = "#1DB954" if is_completed else "#555555"
-    
     # Card container
     with st.container():
-        # Style with custom HTML/CSS
-        st.markdown(f"""
-        <div style="background-color: #282828; border-radius: 10px; padding: 15px; margin-bottom: 15px; border-left: 5px solid {border_color};">
-            <div style="display: flex; justify-content: space-between; align-items: center;">
-                <div>
-                    <h3 style="margin-top: 0; margin-bottom: 5px;">{name}</h3>
-                    <p style="color: #cccccc; margin-top: 0;">{description}</p>
-                </div>
-                <div style="text-align: center;">
-                    <div style="background-color: #1DB954; border-radius: 50%; width: 50px; height: 50px; display: flex; align-items: center; justify-content: center;">
-                        <span style="color: white; font-weight: bold;">{points}</span>
-                    </div>
-                    <div style="font-size: 12px; margin-top: 5px;">{"Completed" if is_completed else "Locked"}</div>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        # Styles come from static/css/cards.css
+        st.markdown(ACHIEVEMENT_CARD_TMPL.render(
+            name=name,
+            description=description,
+            points=points,
+            is_completed=is_completed
+        ), unsafe_allow_html=True)
 
 def render_learning_path_card(path: Dict[str, Any],
                            progress: float = 0.0,
@@ -284,8 +283,8 @@ def render_learning_path_card(path: Dict[str, Any],
         on_continue (callable, optional): Function to call when continue button is clicked
         key_prefix (str): Prefix for component keys
     """
-    # Generate random key suffix for uniqueness
-    key = f"{key_prefix}_{random.randint(1000, 9999)}"
+    # Content-derived key so widgets keep their identity across reruns
+    key = _card_key(key_prefix, path.get('id'), path.get('name'))
     
     # Extract path data
     name = path.get('name', 'Untitled Path')
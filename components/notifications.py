@@ -1,7 +1,41 @@
 import streamlit as st
 from typing import Dict, List, Any, Optional, Callable, Union
 import time
-import random
+import heapq
+import itertools
+from types import MappingProxyType
+from collections import OrderedDict
+from jinja2 import BaseLoader, Environment
+
+# Card markup is compiled once at import; autoescape keeps user text inert
+_ENV = Environment(loader=BaseLoader(), autoescape=True, cache_size=-1)
+
+# Process-wide id sequence; ids only need to be unique, not time-ordered
+_notification_ids = itertools.count()
+
+# Icon for each notification type; each has a matching .notif-<type> rule (read-only)
+_ICON_MAP = MappingProxyType({
+    "info": "ℹ️",
+    "success": "✅",
+    "warning": "⚠️",
+    "error": "❌"
+})
+
+# Choices of the notification action picker ("" is the idle state)
+NOTIFICATION_ACTIONS = ("", "Dismiss", "Mark as read", "View details")
+
+# Type and read-state styling lives in static/css/cards.css (.notif-*)
+NOTIFICATION_CARD_TMPL = _ENV.from_string("""
+<div class="notif notif-{{ type }} {{ 'notif-read' if read else 'notif-unread' }}">
+    <div class="notif-body">
+        <span class="notif-icon">{{ icon }}</span>
+        <div>{% if title %}<strong>{{ title }}</strong><br>{% endif %}
+            <span>{{ message }}</span>
+        </div>
+    </div>
+    <div class="notif-time">{{ formatted_time }}</div>
+</div>
+""")
 
 class NotificationManager:
     """
@@ -17,12 +51,20 @@ class NotificationManager:
         """
         self.max_notifications = max_notifications
         
-        # Initialize notification state in session
+        # Initialize notification state in session (id -> notification, oldest first)
         if "notifications" not in st.session_state:
-            st.session_state.notifications = []
+            st.session_state.notifications = OrderedDict()
             
         if "notification_count" not in st.session_state:
             st.session_state.notification_count = 0
+        
+        # Running unread count and (expiry time, id) min-heap, so reruns
+        # don't have to scan every notification
+        if "notification_unread" not in st.session_state:
+            st.session_state.notification_unread = 0
+            
+        if "notification_expiry" not in st.session_state:
+            st.session_state.notification_expiry = []
     
     def add(self, message: str, type: str = "info", duration: int = 5, title: Optional[str] = None):
         """
@@ -35,7 +77,9 @@ class NotificationManager:
             title (str, optional): Notification title
         """
         # Generate unique ID
-        notification_id = f"notification_{int(time.time())}_{random.randint(1000, 9999)}"
+        notification_id = f"notification_{next(_notification_ids)}"
+        
+        timestamp = time.time()
         
         # Create notification object
         notification = {
@@ -44,17 +88,25 @@ class NotificationManager:
             "type": type,
             "duration": duration,
             "title": title,
-            "timestamp": time.time(),
+            "timestamp": timestamp,
+            "formatted_time": time.strftime("%H:%M:%S", time.localtime(timestamp)),
             "read": False
         }
         
         # Add to state
-        st.session_state.notifications.append(notification)
+        notifications = st.session_state.notifications
+        notifications[notification_id] = notification
         st.session_state.notification_count += 1
+        st.session_state.notification_unread += 1
+        
+        if duration > 0:
+            heapq.heappush(st.session_state.notification_expiry, (timestamp + duration, notification_id))
         
-        # Trim if exceeding max
-        if len(st.session_state.notifications) > self.max_notifications:
-            st.session_state.notifications = st.session_state.notifications[-self.max_notifications:]
+        # Trim the oldest if exceeding max
+        while len(notifications) > self.max_notifications:
+            _, dropped = notifications.popitem(last=False)
+            if not dropped["read"]:
+                st.session_state.notification_unread -= 1
     
     def add_success(self, message: str, duration: int = 5, title: Optional[str] = None):
         """Shorthand for success notification"""
@@ -74,65 +126,70 @@ class NotificationManager:
     
     def clear(self):
         """Clear all notifications"""
-        st.session_state.notifications = []
+        st.session_state.notifications = OrderedDict()
         st.session_state.notification_count = 0
+        st.session_state.notification_unread = 0
+        st.session_state.notification_expiry = []
     
     def mark_read(self, notification_id: str):
         """Mark a notification as read"""
-        for notif in st.session_state.notifications:
-            if notif["id"] == notification_id:
-                notif["read"] = True
-                break
+        notif = st.session_state.notifications.get(notification_id)
+        if notif and not notif["read"]:
+            notif["read"] = True
+            st.session_state.notification_unread -= 1
     
     def mark_all_read(self):
         """Mark all notifications as read"""
-        for notif in st.session_state.notifications:
+        for notif in st.session_state.notifications.values():
             notif["read"] = True
+        st.session_state.notification_unread = 0
     
     def remove(self, notification_id: str):
         """Remove a notification"""
-        st.session_state.notifications = [n for n in st.session_state.notifications if n["id"] != notification_id]
+        notif = st.session_state.notifications.pop(notification_id, None)
+        if notif and not notif["read"]:
+            st.session_state.notification_unread -= 1
     
     def get_unread_count(self) -> int:
         """Get count of unread notifications"""
-        return sum(1 for n in st.session_state.notifications if not n["read"])
+        return st.session_state.notification_unread
     
     def get_all(self) -> List[Dict[str, Any]]:
         """Get all notifications"""
-        return st.session_state.notifications
+        return list(st.session_state.notifications.values())
     
     def get_latest(self) -> Optional[Dict[str, Any]]:
         """Get the latest notification"""
-        if st.session_state.notifications:
-            return st.session_state.notifications[-1]
-        return None
+        return next(reversed(st.session_state.notifications.values()), None)
     
     def auto_dismiss(self):
         """Auto-dismiss notifications based on duration"""
         current_time = time.time()
-        st.session_state.notifications = [
-            n for n in st.session_state.notifications 
-            if n["duration"] == 0 or current_time - n["timestamp"] < n["duration"]
-        ]
+        expiry = st.session_state.notification_expiry
+        
+        # Only expired entries are popped; ids already removed are no-ops
+        while expiry and expiry[0][0] <= current_time:
+            _, notification_id = heapq.heappop(expiry)
+            self.remove(notification_id)
     
     def render_toast(self, notification: Dict[str, Any]):
         """
         Render a single notification as a toast
         
+        Toasts are shown client-side and fade on their own, so each
+        notification is toasted at most once rather than on every rerun.
+        
         Args:
             notification (dict): Notification object
         """
-        message = notification.get("message", "")
-        type = notification.get("type", "info")
+        if notification.get("toasted"):
+            return
         
-        if type == "success":
-            st.success(message)
-        elif type == "warning":
-            st.warning(message)
-        elif type == "error":
-            st.error(message)
-        else:  # Default to info
-            st.info(message)
+        st.toast(
+            notification.get("message", ""),
+            icon=_ICON_MAP.get(notification.get("type", "info"), _ICON_MAP["info"])
+        )
+        notification["toasted"] = True
     
     def render_notification_center(self, on_click: Optional[Callable] = None):
         """
@@ -148,10 +205,7 @@ class NotificationManager:
         unread_count = self.get_unread_count()
         
         # Notification bell icon with badge
-        if unread_count > 0:
-            bell_icon = f"🔔 ({unread_count})"
-        else:
-            bell_icon = "🔔"
+        bell_icon = f"🔔 ({unread_count})" if unread_count else "🔔"
         
         # Create an expander for the notification center
         with st.expander(bell_icon, expanded=False):
@@ -161,86 +215,88 @@ class NotificationManager:
                 # Add clear all button
                 col1, col2 = st.columns([3, 1])
                 with col2:
-                    if st.button("Clear All"):
-                        self.clear()
-                        st.rerun()
+                    st.button("Clear All", on_click=self.clear)
+                
+                # Render all notifications as a single element, newest first
+                notifications = st.session_state.notifications
+                st.markdown(
+                    "".join(self._render_notification_html(n) for n in reversed(notifications.values())),
+                    unsafe_allow_html=True
+                )
                 
-                # Render each notification
-                for notification in reversed(st.session_state.notifications):
-                    self._render_notification_card(notification, on_click)
+                self._render_notification_actions(notifications, on_click)
     
-    def _render_notification_card(self, notification: Dict[str, Any], on_click: Optional[Callable] = None):
+    def _render_notification_html(self, notification: Dict[str, Any]) -> str:
         """
-        Render a notification card
+        Build the markup for a notification card
         
         Args:
             notification (dict): Notification object
-            on_click (callable, optional): Function to call when the notification is clicked
+            
+        Returns:
+            str: Card HTML
         """
-        notification_id = notification.get("id", "")
-        message = notification.get("message", "")
         type = notification.get("type", "info")
-        title = notification.get("title")
-        timestamp = notification.get("timestamp", 0)
-        read = notification.get("read", False)
-        
-        # Format timestamp
-        formatted_time = time.strftime("%H:%M:%S", time.localtime(timestamp))
-        
-        # Determine icon and color based on type
-        icon_map = {
-            "info": "ℹ️",
-            "success": "✅",
-            "warning": "⚠️",
-            "error": "❌"
-        }
-        icon = icon_map.get(type, "ℹ️")
-        
-        # Create container for notification
-        with st.container():
-            # Style with custom HTML
-            if read:
-                opacity = 0.7
-                background = "#333333"
-            else:
-                opacity = 1.0
-                background = "#2A2A2A"
-            
-            html = f"""
-            <div style="background-color: {background}; border-radius: 5px; padding: 10px; margin-bottom: 10px; opacity: {opacity}; border-left: 3px solid {'#1DB954' if type == 'success' else '#ff9800' if type == 'warning' else '#f44336' if type == 'error' else '#2196f3'};">
-                <div style="display: flex; justify-content: space-between; align-items: center;">
-                    <div style="display: flex; align-items: center;">
-                        <span style="font-size: 18px; margin-right: 8px;">{icon}</span>
-                        <div>
-                            {f"<strong>{title}</strong><br>" if title else ""}
-                            <span>{message}</span>
-                        </div>
-                    </div>
-                    <div style="color: #999; font-size: 12px;">{formatted_time}</div>
-                </div>
-            </div>
-            """
-            
-            st.markdown(html, unsafe_allow_html=True)
-            
-            # Actions
-            col1, col2 = st.columns([4, 1])
-            
-            with col2:
-                if st.button("Dismiss", key=f"dismiss_{notification_id}"):
-                    self.remove(notification_id)
-                    st.rerun()
-            
-            with col1:
-                if not read:
-                    if st.button("Mark as Read", key=f"read_{notification_id}"):
-                        self.mark_read(notification_id)
-                        st.rerun()
-            
-            # Handle click
-            if on_click and st.button("View Details", key=f"view_{notification_id}"):
-                self.mark_read(notification_id)
-                on_click(notification)
+        if type not in _ICON_MAP:
+            type = "info"
+        
+        return NOTIFICATION_CARD_TMPL.render(
+            type=type,
+            read=notification.get("read", False),
+            icon=_ICON_MAP[type],
+            title=notification.get("title"),
+            message=notification.get("message", ""),
+            formatted_time=notification.get("formatted_time", "")
+        )
+    
+    def _render_notification_actions(self, notifications: Dict[str, Dict[str, Any]], on_click: Optional[Callable] = None):
+        """
+        Render one action picker acting on a selected notification
+        
+        Args:
+            notifications (dict): Notifications by id, oldest first
+            on_click (callable, optional): Function to call when a notification is viewed
+        """
+        actions = NOTIFICATION_ACTIONS if on_click else NOTIFICATION_ACTIONS[:-1]
+        
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            st.selectbox(
+                "Notification",
+                list(reversed(notifications)),
+                format_func=lambda nid: notifications[nid].get("title") or notifications[nid].get("message", ""),
+                key="notification_selected",
+                label_visibility="collapsed"
+            )
+        
+        with col2:
+            st.selectbox(
+                "Action",
+                actions,
+                format_func=lambda action: action or "Action...",
+                key="notification_action",
+                label_visibility="collapsed",
+                on_change=self._apply_notification_action
+            )
+        
+        # Handle click (flagged by the action callback)
+        viewed_id = st.session_state.pop("notification_viewed", None)
+        if on_click and viewed_id in notifications:
+            on_click(notifications[viewed_id])
+    
+    def _apply_notification_action(self):
+        """Apply the picked action to the selected notification, then reset the picker"""
+        action = st.session_state.notification_action
+        notification_id = st.session_state.get("notification_selected")
+        st.session_state.notification_action = ""
+        
+        if action == "Dismiss":
+            self.remove(notification_id)
+        elif action in ("Mark as read", "View details"):
+            self.mark_read(notification_id)
+            if action == "View details":
+                st.session_state.notification_viewed = notification_id
 
 # Create a global notification manager
 notifications = NotificationManager()
\ No newline at end of file
@@ -1,11 +1,138 @@
+import functools
+import json
+import os
+import re
+import logging
 import streamlit as st
-from typing import Dict, List, Any, Optional, Callable, Union
-import random
-import time
+from typing import Dict, List, Any, Optional, Callable, Union, NamedTuple
+from time import monotonic as _monotonic
+
+from config import QUIZ_DIR, CACHE_TTL, QUIZ_STATE_DIR
+from utils.streamlit_utils import fragment, FRAGMENTS_SUPPORTED
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Question files saved by generate_quiz_questions: QUIZ_DIR/<bank>/question_<n>.json
+_QUESTION_FILE_RE = re.compile(r'^question_(\d+)\.json$')
+
+# How often a running quiz timer refreshes its display
+TIMER_REFRESH_SECONDS = 1
+
+class Question(NamedTuple):
+    """Quiz question normalized once in set_questions for attribute access"""
+    id: str
+    text: str
+    options: Dict[str, str]
+    answer: str
+    explanation: str
+    labels: Dict[str, str]  # option key -> "key: text" radio label
+    option_keys: tuple  # option keys in display order
+    positions: Dict[str, int]  # option key -> index in option_keys
+    
+    @classmethod
+    def from_dict(cls, question: Dict[str, Any]) -> "Question":
+        """Build a record from a question dict as produced by generate_quiz_questions"""
+        options = question.get("options", {})
+        option_keys = tuple(options)
+        return cls(
+            id=question.get("id", ""),
+            text=question.get("question", ""),
+            options=options,
+            answer=question.get("answer", ""),
+            explanation=question.get("explanation", ""),
+            labels={key: f"{key}: {text}" for key, text in options.items()},
+            option_keys=option_keys,
+            positions={key: i for i, key in enumerate(option_keys)}
+        )
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def _load_question_bank(bank_dir: str, mtime: float) -> List[Dict[str, Any]]:
+    """Parse a question bank; mtime is part of the cache key so edits are picked up"""
+    numbered = []
+    for entry in os.scandir(bank_dir):
+        match = _QUESTION_FILE_RE.match(entry.name)
+        if match:
+            with open(entry.path, 'r', encoding='utf-8') as f:
+                numbered.append((int(match.group(1)), json.load(f)))
+    
+    return [question for _, question in sorted(numbered, key=lambda item: item[0])]
+
+def load_questions(bank_id: str) -> List[Dict[str, Any]]:
+    """
+    Load a saved question bank for QuizGenerator.set_questions
+    
+    The list is shared across reruns and sessions (st.cache_resource), so
+    callers must not mutate it or the question dicts inside it.
+    
+    Args:
+        bank_id (str): Question bank directory name under QUIZ_DIR
+        
+    Returns:
+        list: Questions in file order, or an empty list if the bank is missing
+    """
+    bank_dir = os.path.join(QUIZ_DIR, bank_id)
+    try:
+        # Newest file change, so rewritten question files invalidate the cache
+        mtime = max(
+            (entry.stat().st_mtime for entry in os.scandir(bank_dir) if _QUESTION_FILE_RE.match(entry.name)),
+            default=0.0
+        )
+        return _load_question_bank(bank_dir, mtime)
+    except FileNotFoundError:
+        logger.warning(f"Question bank not found: {bank_id}")
+        return []
+    except Exception as e:
+        logger.error(f"Error loading question bank {bank_id}: {e}")
+        return []
+
+@functools.lru_cache(maxsize=512)
+def _state_key(prefix: str, suffix: str) -> str:
+    """
+    Build a session-state / widget key, reusing the same string object for
+    repeated (prefix, suffix) pairs across instances and reruns
+    """
+    return f"{prefix}_{suffix}"
+
+@functools.lru_cache(maxsize=128)
+def _build_gauge_html(score: int) -> str:
+    """
+    Build the score gauge markup (a pure function of the 0-100 score)
+    
+    Args:
+        score (int): Score out of 100
+        
+    Returns:
+        str: Gauge HTML
+    """
+    return f"""
+    <div style="text-align: center;">
+        <div style="display: inline-block; position: relative; width: 200px; height: 100px; overflow: hidden;">
+            <div style="background-color: #ddd; height: 100px; width: 200px; border-radius: 100px 100px 0 0;"></div>
+            <div style="position: absolute; top: 0; left: 0; background-color: {'#1DB954' if score >= 70 else '#ff9800' if score >= 50 else '#f44336'}; height: 100px; width: 200px; border-radius: 100px 100px 0 0; transform-origin: bottom center; transform: rotate(calc(180deg * {score}/100)) scale(0.99);"></div>
+            <div style="position: absolute; bottom: 0; left: 50%; transform: translateX(-50%); width: 10px; height: 50px; background-color: #333; transform-origin: bottom center;  transform: rotate(calc(180deg * {score}/100));"></div>
+            <div style="position: absolute; bottom: 0; width: 30px; height: 30px; background-color: #333; left: 50%; transform: translateX(-50%); border-radius: 50%;"></div>
+            <div style="position: absolute; bottom: 15px; width: 200px; text-align: center; font-size: 30px; font-weight: bold; color: #333;">{score}%</div>
+        </div>
+    </div>
+    """
 
 class QuizGenerator:
     """Component for generating and managing quizzes"""
     
+    # (key attribute, default factory) for the quiz state; factories give
+    # each session its own list/dict instead of sharing one object
+    _STATE_DEFAULTS = (
+        ("_k_questions", list),
+        ("_k_index", int),
+        ("_k_responses", dict),
+        ("_k_completed", bool),
+        ("_k_score", int),
+        ("_k_answer_map", dict),
+        ("_k_correct", int),
+        ("_k_records", tuple)
+    )
+    
     def __init__(self, key_prefix: str = "quiz_gen"):
         """
         Initialize quiz generator
@@ -15,44 +142,130 @@ class QuizGenerator:
         """
         self.key_prefix = key_prefix
         
+        # Session state and widget keys, resolved once per instance
+        self._k_questions = _state_key(key_prefix, "questions")
+        self._k_index = _state_key(key_prefix, "current_index")
+        self._k_responses = _state_key(key_prefix, "responses")
+        self._k_completed = _state_key(key_prefix, "completed")
+        self._k_score = _state_key(key_prefix, "score")
+        self._k_answer_map = _state_key(key_prefix, "answer_map")
+        self._k_correct = _state_key(key_prefix, "correct_count")
+        self._k_records = _state_key(key_prefix, "records")
+        self._k_prev_btn = _state_key(key_prefix, "prev_btn")
+        self._k_submit_btn = _state_key(key_prefix, "submit_btn")
+        self._k_skip_btn = _state_key(key_prefix, "skip_btn")
+        self._k_restart_btn = _state_key(key_prefix, "restart_btn")
+        self._k_review_btn = _state_key(key_prefix, "review_btn")
+        
         # Initialize quiz state in session if needed
         self._init_session_state()
     
     def _init_session_state(self):
-        """Initialize session state for quiz"""
-        # Quiz questions
-        if f"{self.key_prefix}_questions" not in st.session_state:
-            st.session_state[f"{self.key_prefix}_questions"] = []
+        """Initialize session state for quiz, resuming a saved quiz for a new session"""
+        is_new_session = self._k_questions not in st.session_state
+        
+        for key_attr, default in self._STATE_DEFAULTS:
+            st.session_state.setdefault(getattr(self, key_attr), default())
         
-        # Current question index
-        if f"{self.key_prefix}_current_index" not in st.session_state:
-            st.session_state[f"{self.key_prefix}_current_index"] = 0
+        if is_new_session:
+            self._restore_snapshot()
+    
+    def _snapshot_path(self) -> Optional[str]:
+        """
+        Path of the signed-in user's quiz snapshot
+        
+        Returns:
+            str: Snapshot path, or None when no user is signed in
+        """
+        user_id = getattr(st.session_state.get("session"), "user_id", None)
+        if not user_id:
+            return None
         
-        # User responses
-        if f"{self.key_prefix}_responses" not in st.session_state:
-            st.session_state[f"{self.key_prefix}_responses"] = {}
+        return os.path.join(QUIZ_STATE_DIR, user_id, f"{self.key_prefix}.json")
+    
+    def _save_snapshot(self):
+        """Persist the quiz progress so it survives server restarts"""
+        snapshot_path = self._snapshot_path()
+        if not snapshot_path:
+            return
         
-        # Quiz completed flag
-        if f"{self.key_prefix}_completed" not in st.session_state:
-            st.session_state[f"{self.key_prefix}_completed"] = False
+        state = st.session_state
+        snapshot = {
+            "questions": state[self._k_questions],
+            "current_index": state[self._k_index],
+            "responses": state[self._k_responses],
+            "completed": state[self._k_completed],
+            "score": state[self._k_score],
+            "correct_count": state[self._k_correct]
+        }
+        
+        try:
+            os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+            
+            # Write atomically so a crash never leaves a truncated snapshot
+            tmp_path = f"{snapshot_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, snapshot_path)
+        except Exception as e:
+            logger.error(f"Error saving quiz snapshot: {e}")
+    
+    def _restore_snapshot(self):
+        """Load the quiz progress saved by _save_snapshot, if any"""
+        snapshot_path = self._snapshot_path()
+        if not snapshot_path or not os.path.exists(snapshot_path):
+            return
         
-        # Quiz score
-        if f"{self.key_prefix}_score" not in st.session_state:
-            st.session_state[f"{self.key_prefix}_score"] = 0
+        try:
+            with open(snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            
+            state = st.session_state
+            self._apply_questions(snapshot["questions"])
+            state[self._k_index] = snapshot["current_index"]
+            state[self._k_responses] = snapshot["responses"]
+            state[self._k_completed] = snapshot["completed"]
+            state[self._k_score] = snapshot["score"]
+            state[self._k_correct] = snapshot["correct_count"]
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable quiz snapshot {snapshot_path}: {e}")
     
     def set_questions(self, questions: List[Dict[str, Any]]):
         """
         Set quiz questions
         
+        The list is stored by reference (no copy), so shared banks from
+        load_questions cost nothing extra per session.
+        
         Args:
             questions (list): List of question dictionaries
         """
         # Reset quiz state
-        st.session_state[f"{self.key_prefix}_questions"] = questions
-        st.session_state[f"{self.key_prefix}_current_index"] = 0
-        st.session_state[f"{self.key_prefix}_responses"] = {}
-        st.session_state[f"{self.key_prefix}_completed"] = False
-        st.session_state[f"{self.key_prefix}_score"] = 0
+        self._apply_questions(questions)
+        st.session_state[self._k_index] = 0
+        st.session_state[self._k_responses] = {}
+        st.session_state[self._k_completed] = False
+        st.session_state[self._k_score] = 0
+        st.session_state[self._k_correct] = 0
+        
+        self._save_snapshot()
+    
+    def restart(self):
+        """Restart the quiz from the first question, keeping the questions"""
+        state = st.session_state
+        state[self._k_index] = 0
+        state[self._k_responses] = {}
+        state[self._k_completed] = False
+        
+        self._save_snapshot()
+    
+    def _apply_questions(self, questions: List[Dict[str, Any]]):
+        """Store questions with their normalized records and answer lookup"""
+        # Built once instead of on every rerun
+        records = tuple(Question.from_dict(q) for q in questions)
+        st.session_state[self._k_questions] = questions
+        st.session_state[self._k_records] = records
+        st.session_state[self._k_answer_map] = {q.id: q.answer for q in records}
     
     def get_current_question(self) -> Optional[Dict[str, Any]]:
         """
@@ -61,8 +274,8 @@ class QuizGenerator:
         Returns:
             dict: Current question or None if no questions
         """
-        questions = st.session_state[f"{self.key_prefix}_questions"]
-        index = st.session_state[f"{self.key_prefix}_current_index"]
+        questions = st.session_state[self._k_questions]
+        index = st.session_state[self._k_index]
         
         if not questions or index >= len(questions):
             return None
@@ -77,26 +290,30 @@ class QuizGenerator:
             question_id (str): Question ID
             response (str): User's response
         """
-        st.session_state[f"{self.key_prefix}_responses"][question_id] = response
+        st.session_state[self._k_responses][question_id] = response
+        self._save_snapshot()
     
     def next_question(self):
         """Move to the next question"""
-        current_index = st.session_state[f"{self.key_prefix}_current_index"]
-        questions = st.session_state[f"{self.key_prefix}_questions"]
+        current_index = st.session_state[self._k_index]
+        questions = st.session_state[self._k_questions]
         
         if current_index < len(questions) - 1:
-            st.session_state[f"{self.key_prefix}_current_index"] = current_index + 1
+            st.session_state[self._k_index] = current_index + 1
         else:
             # Reached the end of the quiz
-            st.session_state[f"{self.key_prefix}_completed"] = True
+            st.session_state[self._k_completed] = True
             self._calculate_score()
+        
+        self._save_snapshot()
     
     def previous_question(self):
         """Move to the previous question"""
-        current_index = st.session_state[f"{self.key_prefix}_current_index"]
+        current_index = st.session_state[self._k_index]
         
         if current_index > 0:
-            st.session_state[f"{self.key_prefix}_current_index"] = current_index - 1
+            st.session_state[self._k_index] = current_index - 1
+            self._save_snapshot()
     
     def is_completed(self) -> bool:
         """
@@ -105,7 +322,7 @@ class QuizGenerator:
         Returns:
             bool: True if completed, False otherwise
         """
-        return st.session_state[f"{self.key_prefix}_completed"]
+        return st.session_state[self._k_completed]
     
     def get_score(self) -> int:
         """
@@ -114,97 +331,99 @@ class QuizGenerator:
         Returns:
             int: Score out of 100
         """
-        return st.session_state[f"{self.key_prefix}_score"]
+        return st.session_state[self._k_score]
     
     def _calculate_score(self):
         """Calculate quiz score"""
-        questions = st.session_state[f"{self.key_prefix}_questions"]
-        responses = st.session_state[f"{self.key_prefix}_responses"]
+        questions = st.session_state[self._k_questions]
+        responses = st.session_state[self._k_responses]
+        answer_map = st.session_state[self._k_answer_map]
         
         if not questions:
-            st.session_state[f"{self.key_prefix}_score"] = 0
+            st.session_state[self._k_score] = 0
+            st.session_state[self._k_correct] = 0
             return
         
-        # Count correct answers
-        correct_count = 0
-        
-        for question in questions:
-            question_id = question.get("id", "")
-            correct_answer = question.get("answer", "")
-            
-            if question_id in responses and responses[question_id] == correct_answer:
-                correct_count += 1
+        # Count correct answers (kept for render_results)
+        correct_count = sum(1 for question_id, response in responses.items() if answer_map.get(question_id) == response)
+        st.session_state[self._k_correct] = correct_count
         
         # Calculate percentage score
         score = int((correct_count / len(questions)) * 100)
-        st.session_state[f"{self.key_prefix}_score"] = score
+        st.session_state[self._k_score] = score
     
     def render_question(self, on_answer: Optional[Callable] = None):
         """
         Render the current question
         
         Args:
-            on_answer (callable, optional): Function to call when an answer is submitted
+            on_answer (callable, optional): Function to call with (question_id, option)
+                when an answer is submitted; runs inside the Submit button callback,
+                before the rerun, so it should update state rather than render
         """
         # Get current question
-        question = self.get_current_question()
+        state = st.session_state
+        records = state[self._k_records]
+        current_index = state[self._k_index]
         
-        if not question:
+        if current_index >= len(records):
             st.warning("No questions available.")
             return
         
-        # Extract question data
-        question_id = question.get("id", "")
-        question_text = question.get("question", "")
-        options = question.get("options", {})
+        question = records[current_index]
+        question_id = question.id
         
         # Check if user has already answered this question
-        responses = st.session_state[f"{self.key_prefix}_responses"]
+        responses = state[self._k_responses]
         previous_response = responses.get(question_id)
         
         # Display question number and text
-        questions = st.session_state[f"{self.key_prefix}_questions"]
-        current_index = st.session_state[f"{self.key_prefix}_current_index"]
-        
-        st.markdown(f"### Question {current_index + 1} of {len(questions)}")
-        st.markdown(f"**{question_text}**")
+        st.markdown(f"### Question {current_index + 1} of {len(records)}")
+        st.markdown(f"**{question.text}**")
         
-        # Display options as radio buttons
-        selected_option = st.radio(
+        # Display options as radio buttons (options, labels and positions
+        # were built once in set_questions)
+        st.radio(
             "Select your answer:",
-            options=list(options.keys()),
-            format_func=lambda x: f"{x}: {options.get(x, '')}",
-            index=list(options.keys()).index(previous_response) if previous_response in options else 0,
-            key=f"{self.key_prefix}_q{question_id}"
+            options=question.option_keys,
+            format_func=question.labels.__getitem__,
+            index=question.positions.get(previous_response, 0),
+            key=self._question_key(question_id)
         )
         
-        # Submit button
-        col1, col2, col3 = st.columns([1, 1, 1])
+        # Navigation buttons; the first question gets no (empty) Previous column.
+        # Button callbacks update the quiz state before the click's own
+        # rerun, so no extra st.rerun() is needed
+        columns = iter(st.columns(3 if current_index > 0 else 2))
         
-        with col1:
-            if current_index > 0:
-                if st.button("Previous", key=f"{self.key_prefix}_prev_btn"):
-                    self.previous_question()
-                    st.rerun()
+        if current_index > 0:
+            with next(columns):
+                st.button("Previous", key=self._k_prev_btn, on_click=self.previous_question)
         
-        with col2:
-            if st.button("Submit Answer", key=f"{self.key_prefix}_submit_btn"):
-                # Record response
-                self.record_response(question_id, selected_option)
-                
-                # Call callback if provided
-                if on_answer:
-                    on_answer(question_id, selected_option)
-                
-                # Move to next question
-                self.next_question()
-                st.rerun()
+        with next(columns):
+            st.button("Submit Answer", key=self._k_submit_btn, on_click=self._submit_answer,
+                      args=(question_id, on_answer))
         
-        with col3:
-            if st.button("Skip", key=f"{self.key_prefix}_skip_btn"):
-                # Move to next question without recording
-                self.next_question()
-                st.rerun()
+        with next(columns):
+            # Move to next question without recording (finishes the quiz on the last one)
+            st.button("Skip", key=self._k_skip_btn, on_click=self.next_question)
+    
+    def _question_key(self, question_id: str) -> str:
+        """Widget key of a question's answer radio"""
+        return _state_key(self.key_prefix, f"q{question_id}")
+    
+    def _submit_answer(self, question_id: str, on_answer: Optional[Callable] = None):
+        """Record the selected answer and move to the next question (button callback)"""
+        selected_option = st.session_state.get(self._question_key(question_id))
+        
+        self.record_response(question_id, selected_option)
+        
+        # Called here rather than on the next render_question run, which never
+        # comes once the last answer completes the quiz
+        if on_answer:
+            on_answer(question_id, selected_option)
+        
+        self.next_question()
     
     def render_results(self, on_restart: Optional[Callable] = None, on_review: Optional[Callable] = None):
         """
@@ -215,9 +434,9 @@ class QuizGenerator:
             on_review (callable, optional): Function to call when review button is clicked
         """
         # Get quiz data
-        questions = st.session_state[f"{self.key_prefix}_questions"]
-        responses = st.session_state[f"{self.key_prefix}_responses"]
-        score = st.session_state[f"{self.key_prefix}_score"]
+        state = st.session_state
+        questions = state[self._k_questions]
+        score = state[self._k_score]
         
         # Display score
         st.markdown(f"## Quiz Results")
@@ -226,7 +445,7 @@ class QuizGenerator:
         self._render_score_gauge(score)
         
         # Score details
-        correct_count = sum(1 for q in questions if q.get("id") in responses and responses[q.get("id")] == q.get("answer"))
+        correct_count = state[self._k_correct]
         
         st.markdown(f"You answered **{correct_count}** out of **{len(questions)}** questions correctly.")
         
@@ -244,11 +463,8 @@ class QuizGenerator:
         col1, col2 = st.columns(2)
         
         with col1:
-            if st.button("Restart Quiz", key=f"{self.key_prefix}_restart_btn"):
-                # Reset current index but keep questions
-                st.session_state[f"{self.key_prefix}_current_index"] = 0
-                st.session_state[f"{self.key_prefix}_responses"] = {}
-                st.session_state[f"{self.key_prefix}_completed"] = False
+            if st.button("Restart Quiz", key=self._k_restart_btn):
+                self.restart()
                 
                 # Call callback if provided
                 if on_restart:
@@ -257,7 +473,7 @@ class QuizGenerator:
                 st.rerun()
         
         with col2:
-            if st.button("Review Answers", key=f"{self.key_prefix}_review_btn"):
+            if st.button("Review Answers", key=self._k_review_btn):
                 # Call callback if provided
                 if on_review:
                     on_review()
@@ -265,40 +481,36 @@ class QuizGenerator:
     def render_answer_review(self):
         """Render a review of all questions with correct answers"""
         # Get quiz data
-        questions = st.session_state[f"{self.key_prefix}_questions"]
-        responses = st.session_state[f"{self.key_prefix}_responses"]
+        state = st.session_state
+        records = state[self._k_records]
+        responses = state[self._k_responses]
         
-        st.markdown("## Answer Review")
+        # Build the whole review as one markdown element
+        lines = ["## Answer Review"]
         
         # Display each question with correct answer
-        for i, question in enumerate(questions):
-            question_id = question.get("id", "")
-            question_text = question.get("question", "")
-            options = question.get("options", {})
-            correct_answer = question.get("answer", "")
-            explanation = question.get("explanation", "")
-            
+        for i, question in enumerate(records):
             # User's response
-            user_response = responses.get(question_id, "Not answered")
+            user_response = responses.get(question.id, "Not answered")
             
-            # Create container for question
-            with st.container():
-                st.markdown(f"### Question {i + 1}: {question_text}")
-                
-                # Display all options
-                for option_key, option_text in options.items():
-                    if option_key == correct_answer:
-                        st.markdown(f"✅ **{option_key}: {option_text}** (Correct Answer)")
-                    elif option_key == user_response:
-                        st.markdown(f"❌ **{option_key}: {option_text}** (Your Answer)")
-                    else:
-                        st.markdown(f"  {option_key}: {option_text}")
-                
-                # Display explanation if available
-                if explanation:
-                    st.info(f"**Explanation:** {explanation}")
-                
-                st.markdown("---")
+            lines.append(f"### Question {i + 1}: {question.text}")
+            
+            # Display all options
+            for option_key, option_text in question.options.items():
+                if option_key == question.answer:
+                    lines.append(f"✅ **{option_key}: {option_text}** (Correct Answer)")
+                elif option_key == user_response:
+                    lines.append(f"❌ **{option_key}: {option_text}** (Your Answer)")
+                else:
+                    lines.append(f"  {option_key}: {option_text}")
+            
+            # Display explanation if available
+            if question.explanation:
+                lines.append(f"> **Explanation:** {question.explanation}")
+            
+            lines.append("---")
+        
+        st.markdown("\n\n".join(lines))
     
     def _render_score_gauge(self, score: int):
         """
@@ -307,20 +519,7 @@ class QuizGenerator:
         Args:
             score (int): Score out of 100
         """
-        # HTML/CSS for gauge
-        html = f"""
-        <div style="text-align: center;">
-            <div style="display: inline-block; position: relative; width: 200px; height: 100px; overflow: hidden;">
-                <div style="background-color: #ddd; height: 100px; width: 200px; border-radius: 100px 100px 0 0;"></div>
-                <div style="position: absolute; top: 0; left: 0; background-color: {'#1DB954' if score >= 70 else '#ff9800' if score >= 50 else '#f44336'}; height: 100px; width: 200px; border-radius: 100px 100px 0 0; transform-origin: bottom center; transform: rotate(calc(180deg * {score}/100)) scale(0.99);"></div>
-                <div style="position: absolute; bottom: 0; left: 50%; transform: translateX(-50%); width: 10px; height: 50px; background-color: #333; transform-origin: bottom center;  transform: rotate(calc(180deg * {score}/100));"></div>
-                <div style="position: absolute; bottom: 0; width: 30px; height: 30px; background-color: #333; left: 50%; transform: translateX(-50%); border-radius: 50%;"></div>
-                <div style="position: absolute; bottom: 15px; width: 200px; text-align: center; font-size: 30px; font-weight: bold; color: #333;">{score}%</div>
-            </div>
-        </div>
-        """
-        
-        st.markdown(html, unsafe_allow_html=True)
+        st.markdown(_build_gauge_html(score), unsafe_allow_html=True)
 
 class QuizTimer:
     """Timer component for quizzes"""
@@ -334,35 +533,42 @@ class QuizTimer:
         """
         self.key_prefix = key_prefix
         
+        # Session state keys, resolved once per instance; start times are
+        # time.monotonic() readings, immune to wall-clock adjustments
+        self._k_start_time = _state_key(key_prefix, "start_time")
+        self._k_elapsed = _state_key(key_prefix, "elapsed")
+        self._k_running = _state_key(key_prefix, "running")
+        self._k_refresh = _state_key(key_prefix, "refresh")
+        
         # Initialize timer state
-        if f"{self.key_prefix}_start_time" not in st.session_state:
-            st.session_state[f"{self.key_prefix}_start_time"] = None
+        if self._k_start_time not in st.session_state:
+            st.session_state[self._k_start_time] = None
         
-        if f"{self.key_prefix}_elapsed" not in st.session_state:
-            st.session_state[f"{self.key_prefix}_elapsed"] = 0
+        if self._k_elapsed not in st.session_state:
+            st.session_state[self._k_elapsed] = 0
         
-        if f"{self.key_prefix}_running" not in st.session_state:
-            st.session_state[f"{self.key_prefix}_running"] = False
+        if self._k_running not in st.session_state:
+            st.session_state[self._k_running] = False
     
     def start(self):
         """Start the timer"""
-        if not st.session_state[f"{self.key_prefix}_running"]:
-            st.session_state[f"{self.key_prefix}_start_time"] = time.time()
-            st.session_state[f"{self.key_prefix}_running"] = True
+        if not st.session_state[self._k_running]:
+            st.session_state[self._k_start_time] = _monotonic()
+            st.session_state[self._k_running] = True
     
     def stop(self):
         """Stop the timer"""
-        if st.session_state[f"{self.key_prefix}_running"]:
+        if st.session_state[self._k_running]:
             # Add elapsed time
-            elapsed = time.time() - st.session_state[f"{self.key_prefix}_start_time"]
-            st.session_state[f"{self.key_prefix}_elapsed"] += elapsed
-            st.session_state[f"{self.key_prefix}_running"] = False
+            elapsed = _monotonic() - st.session_state[self._k_start_time]
+            st.session_state[self._k_elapsed] += elapsed
+            st.session_state[self._k_running] = False
     
     def reset(self):
         """Reset the timer"""
-        st.session_state[f"{self.key_prefix}_start_time"] = None
-        st.session_state[f"{self.key_prefix}_elapsed"] = 0
-        st.session_state[f"{self.key_prefix}_running"] = False
+        st.session_state[self._k_start_time] = None
+        st.session_state[self._k_elapsed] = 0
+        st.session_state[self._k_running] = False
     
     def get_elapsed(self) -> float:
         """
@@ -371,17 +577,37 @@ class QuizTimer:
         Returns:
             float: Elapsed time in seconds
         """
-        elapsed = st.session_state[f"{self.key_prefix}_elapsed"]
+        state = st.session_state
+        elapsed = state[self._k_elapsed]
         
         # Add current running time if timer is active
-        if st.session_state[f"{self.key_prefix}_running"]:
-            current = time.time() - st.session_state[f"{self.key_prefix}_start_time"]
+        if state[self._k_running]:
+            current = _monotonic() - state[self._k_start_time]
             elapsed += current
         
         return elapsed
     
     def render(self):
-        """Render the timer"""
+        """Render the timer, refreshing it every second while it runs"""
+        if FRAGMENTS_SUPPORTED:
+            self._render_ticking()
+            return
+        
+        self._render_elapsed()
+        
+        # Without fragments the whole page has to rerun; throttle that to
+        # the refresh interval instead of rerunning in a tight loop
+        if st.session_state[self._k_running]:
+            from streamlit_autorefresh import st_autorefresh
+            st_autorefresh(interval=TIMER_REFRESH_SECONDS * 1000, key=self._k_refresh)
+    
+    @fragment(run_every=TIMER_REFRESH_SECONDS)
+    def _render_ticking(self):
+        """Render the elapsed time (reruns on its own as a fragment)"""
+        self._render_elapsed()
+    
+    def _render_elapsed(self):
+        """Render the elapsed time"""
         elapsed = self.get_elapsed()
         
         # Format as minutes and seconds
@@ -390,6 +616,3 @@ class QuizTimer:
         
         # Display timer
         st.markdown(f"⏱️ **Time:** {minutes:02d}:{seconds:02d}")
-        
-        # Update every second
-        st.rerun()
\ No newline at end of file
@@ -2,9 +2,13 @@ import os
 from dotenv import load_dotenv
 import json
 import datetime
+import functools
 
-# Load environment variables from .env file
-load_dotenv()
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Load environment variables from the project's .env file. An explicit path
+# skips find_dotenv's call-stack inspection and parent-directory walk.
+load_dotenv(os.path.join(BASE_DIR, ".env"))
 
 # Application version
 APP_VERSION = "2.1.0"
@@ -70,7 +74,6 @@ if FIREBASE_API_KEY:
     }
 
 # Directory Configuration
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 STATIC_DIR = os.path.join(BASE_DIR, "static")
 AUDIO_DIR = os.path.join(STATIC_DIR, "audio")
 CACHE_DIR = os.path.join(STATIC_DIR, "cache")
@@ -84,13 +87,37 @@ CSS_DIR = os.path.join(STATIC_DIR, "css")
 JS_DIR = os.path.join(STATIC_DIR, "js")
 IMG_DIR = os.path.join(STATIC_DIR, "img")
 
+# Private per-user state, kept outside STATIC_DIR so it is never web-served
+DATA_DIR = os.path.join(BASE_DIR, "data")
+QUIZ_STATE_DIR = os.path.join(DATA_DIR, "quiz")
+
 # Ensure all necessary directories exist
-for directory in [
+REQUIRED_DIRS = [
     AUDIO_DIR, TRANSLATIONS_DIR, CACHE_DIR, ANALYTICS_DIR, 
     CSS_DIR, JS_DIR, IMG_DIR, QUIZ_DIR, USER_DATA_DIR,
-    EXPORT_DIR, OFFLINE_DIR
-]:
-    os.makedirs(directory, exist_ok=True)
+    EXPORT_DIR, OFFLINE_DIR, QUIZ_STATE_DIR
+]
+
+# Records the directory list that was last created, so warm starts skip the
+# makedirs pass; adding a directory above changes the contents and reruns it
+DIRS_SENTINEL = os.path.join(STATIC_DIR, ".dirs_initialized")
+
+def _ensure_directories():
+    expected = "\n".join(REQUIRED_DIRS)
+    try:
+        with open(DIRS_SENTINEL, 'r') as f:
+            if f.read() == expected:
+                return
+    except OSError:
+        pass
+    
+    for directory in REQUIRED_DIRS:
+        os.makedirs(directory, exist_ok=True)
+    
+    with open(DIRS_SENTINEL, 'w') as f:
+        f.write(expected)
+
+_ensure_directories()
 
 # Cache settings
 CACHE_TTL = 60 * 60 * 24 * 7  # 1 week in seconds
@@ -101,6 +128,7 @@ AUDIO_COMPRESSION = True
 AUDIO_COMPRESSION_BITRATE = "128k"
 AUDIO_FORMATS = ["mp3", "ogg", "wav"]
 DEFAULT_AUDIO_FORMAT = "mp3"
+AUDIO_IO_BUFFER_SIZE = 128 * 1024  # Buffer for audio file I/O (default is 8KB)
 
 # Security settings
 JWT_SECRET = os.getenv("JWT_SECRET", os.urandom(24).hex())
@@ -142,7 +170,9 @@ APP_INFO = {
     "license": "MIT",
 }
 
-# Export current config for client-side use
+# Export current config for client-side use (built from constants, so
+# computed once; callers must not mutate the returned dict)
+@functools.lru_cache(maxsize=1)
 def get_client_config():
     return {
         "app_version": APP_VERSION,
@@ -163,7 +193,20 @@ def get_client_config():
 def save_client_config():
     client_config = get_client_config()
     config_path = os.path.join(JS_DIR, "config.js")
-    with open(config_path, 'w') as f:
-        f.write(f"const MINDSNACKS_CONFIG = {json.dumps(client_config, indent=2)};")
+    content = f"const MINDSNACKS_CONFIG = {json.dumps(client_config, indent=2)};"
+    
+    # Skip the write when the file is already up to date
+    try:
+        with open(config_path, 'r') as f:
+            if f.read() == content:
+                return client_config
+    except OSError:
+        pass
+    
+    # Write atomically so the browser never fetches a half-written file
+    tmp_path = f"{config_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(content)
+    os.replace(tmp_path, config_path)
     
     return client_config
\ No newline at end of file
@@ -3,14 +3,23 @@ import random
 import logging
 import json
 import os
+from collections import OrderedDict
 from datetime import datetime
 import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Number of (user, k, exclusions) -> recommendations results kept in memory
+RECOMMENDATION_CACHE_SIZE = 256
+
+# Binary matrix files stored next to the JSON model file
+CONTENT_MATRIX_SUFFIX = ".content.npz"
+USER_MATRIX_SUFFIX = ".users.npy"
+
 class RecommendationModel:
     """
     Model for generating content recommendations based on user history and preferences
@@ -24,13 +33,26 @@ class RecommendationModel:
             model_file (str, optional): Path to pre-trained model file
         """
         self.user_vectors = {}
-        self.content_vectors = {}
+        
+        # Running per-user {'sum': summed content vector, 'seen': content IDs},
+        # so an interaction folds in one row instead of re-averaging the history
+        self.user_state: Dict[str, Dict[str, Any]] = {}
+        self._recommendation_cache: OrderedDict = OrderedDict()
+        
+        # L2-normalized TF-IDF rows, one per content item; cosine similarity
+        # against every item is then a single sparse matrix-vector product
+        self.content_matrix = None
+        self.content_id_index: List[str] = []
+        self.content_id_to_row: Dict[str, int] = {}
+        
+        # float32 halves the matrix footprint and the bandwidth of every scoring pass
         self.vectorizer = TfidfVectorizer(
             analyzer='word',
             ngram_range=(1, 2),
             min_df=2,
             max_df=0.8,
-            stop_words='english'
+            stop_words='english',
+            dtype=np.float32
         )
         
         # Load pre-trained model if provided
@@ -53,7 +75,7 @@ class RecommendationModel:
             
             for item in content_items:
                 item_id = item.get('id')
-                if not item_id:
+                if not item_id or item_id in content_docs:
                     continue
                 
                 # Combine text fields for better representation
@@ -66,13 +88,12 @@ class RecommendationModel:
             if documents:
                 X = self.vectorizer.fit_transform(documents)
                 
-                # Create content vectors
-                for i, item_id in enumerate(content_ids):
-                    self.content_vectors[item_id] = X[i]
+                # Create content matrix
+                self._set_content(content_ids, normalize(X, norm='l2', axis=1))
+                self._recommendation_cache.clear()
                 
                 # Generate user vectors based on their history
-                for user_id, history in user_histories.items():
-                    self._update_user_vector(user_id, history)
+                self._update_user_vectors(user_histories)
                 
                 logger.info(f"Trained recommendation model with {len(content_items)} items and {len(user_histories)} users")
             else:
@@ -92,17 +113,17 @@ class RecommendationModel:
         """
         try:
             # Get user history
-            if user_id not in self.user_vectors:
-                self._update_user_vector(user_id, [content_id])
-            else:
-                # Add to user history and update vector
-                history = self._get_user_history(user_id)
-                
-                # Add new interaction if not already in history
-                if content_id not in history:
-                    history.append(content_id)
-                    self._update_user_vector(user_id, history)
+            state = self.user_state.get(user_id)
+            if state is None:
+                self._update_user_vectors({user_id: [content_id]})
+            elif content_id not in state['seen'] and content_id in self.content_id_to_row:
+                # Add new interaction to the running sum and update vector
+                row = self.content_id_to_row[content_id]
+                state['sum'] += self.content_matrix[row].toarray().ravel()
+                state['seen'].add(content_id)
+                self.user_vectors[user_id] = normalize(state['sum'].reshape(1, -1)).ravel()
             
+            self._invalidate_recommendations(user_id)
             logger.debug(f"Updated user vector for {user_id} with {content_id}")
         
         except Exception as e:
@@ -126,23 +147,19 @@ class RecommendationModel:
                 # No user data, return random recommendations
                 return self._random_recommendations(num_recommendations, exclude_ids)
             
+            # Serve repeated requests from the cache until the user's next interaction
+            cache_key = (user_id, num_recommendations, frozenset(exclude_ids or ()))
+            cached = self._recommendation_cache.get(cache_key)
+            if cached is not None:
+                self._recommendation_cache.move_to_end(cache_key)
+                return list(cached)
+            
             # Get user vector
             user_vector = self.user_vectors[user_id]
             
-            # Calculate similarity scores with all content items
-            scores = []
-            for content_id, content_vector in self.content_vectors.items():
-                # Skip if in exclude list
-                if exclude_ids and content_id in exclude_ids:
-                    continue
-                
-                # Calculate similarity score
-                similarity = cosine_similarity(user_vector, content_vector)[0][0]
-                scores.append((content_id, similarity))
-            
-            # Sort by similarity score and get top N
-            scores.sort(key=lambda x: x[1], reverse=True)
-            recommendations = [content_id for content_id, _ in scores[:num_recommendations]]
+            # Calculate similarity scores with all content items at once
+            scores = self.content_matrix @ user_vector
+            recommendations = self._top_k(scores, num_recommendations, exclude_ids)
             
             logger.debug(f"Generated {len(recommendations)} recommendations for user {user_id}")
             
@@ -154,6 +171,10 @@ class RecommendationModel:
                 )
                 recommendations.extend(additional)
             
+            self._recommendation_cache[cache_key] = tuple(recommendations)
+            if len(self._recommendation_cache) > RECOMMENDATION_CACHE_SIZE:
+                self._recommendation_cache.popitem(last=False)
+            
             return recommendations
         
         except Exception as e:
@@ -174,30 +195,17 @@ class RecommendationModel:
             list: List of similar content IDs
         """
         try:
-            if content_id not in self.content_vectors:
+            if content_id not in self.content_id_to_row:
                 # Content not found, return random recommendations
                 return self._random_recommendations(num_recommendations, exclude_ids)
             
-            # Get content vector
-            content_vector = self.content_vectors[content_id]
+            # Calculate similarity scores with all content items at once
+            row = self.content_id_to_row[content_id]
+            scores = (self.content_matrix @ self.content_matrix[row].T).toarray().ravel()
             
-            # Calculate similarity scores with all other content items
-            scores = []
-            for other_id, other_vector in self.content_vectors.items():
-                # Skip if same item or in exclude list
-                if other_id == content_id:
-                    continue
-                
-                if exclude_ids and other_id in exclude_ids:
-                    continue
-                
-                # Calculate similarity score
-                similarity = cosine_similarity(content_vector, other_vector)[0][0]
-                scores.append((other_id, similarity))
-            
-            # Sort by similarity score and get top N
-            scores.sort(key=lambda x: x[1], reverse=True)
-            recommendations = [content_id for content_id, _ in scores[:num_recommendations]]
+            # Skip the item itself
+            scores[row] = -np.inf
+            recommendations = self._top_k(scores, num_recommendations, exclude_ids)
             
             logger.debug(f"Generated {len(recommendations)} similar items to {content_id}")
             
@@ -223,26 +231,27 @@ class RecommendationModel:
             model_file (str): Path to save model file
         """
         try:
-            # Convert sparse matrices to lists for serialization
-            serializable_content_vectors = {}
-            for content_id, vector in self.content_vectors.items():
-                serializable_content_vectors[content_id] = vector.toarray().tolist()[0]
+            # Save matrices in binary form; the JSON file only holds row IDs and vocabulary
+            if self.content_matrix is not None:
+                sparse.save_npz(model_file + CONTENT_MATRIX_SUFFIX, self.content_matrix)
             
-            serializable_user_vectors = {}
-            for user_id, vector in self.user_vectors.items():
-                serializable_user_vectors[user_id] = vector.toarray().tolist()[0]
+            user_ids = list(self.user_vectors)
+            if user_ids:
+                np.save(model_file + USER_MATRIX_SUFFIX, np.vstack([self.user_vectors[user_id] for user_id in user_ids]))
             
             # Create model data
             model_data = {
-                'content_vectors': serializable_content_vectors,
-                'user_vectors': serializable_user_vectors,
+                'content_ids': self.content_id_index,
+                'user_ids': user_ids,
                 'vectorizer_vocabulary': self.vectorizer.vocabulary_,
                 'timestamp': datetime.now().isoformat()
             }
             
-            # Save to file
-            with open(model_file, 'w') as f:
+            # Save to file last (atomically), so it never points at missing matrices
+            tmp_path = f"{model_file}.tmp"
+            with open(tmp_path, 'w') as f:
                 json.dump(model_data, f)
+            os.replace(tmp_path, model_file)
             
             logger.info(f"Saved recommendation model to {model_file}")
             return True
@@ -263,17 +272,20 @@ class RecommendationModel:
                 model_data = json.load(f)
             
             # Load vectorizer vocabulary
-            self.vectorizer = TfidfVectorizer(vocabulary=model_data.get('vectorizer_vocabulary', {}))
+            self.vectorizer = TfidfVectorizer(vocabulary=model_data.get('vectorizer_vocabulary', {}), dtype=np.float32)
             
             # Load content vectors
-            self.content_vectors = {}
-            for content_id, vector_list in model_data.get('content_vectors', {}).items():
-                self.content_vectors[content_id] = np.array([vector_list])
+            content_ids = model_data.get('content_ids', [])
+            if content_ids:
+                self._set_content(content_ids, sparse.load_npz(model_file + CONTENT_MATRIX_SUFFIX))
             
             # Load user vectors
             self.user_vectors = {}
-            for user_id, vector_list in model_data.get('user_vectors', {}).items():
-                self.user_vectors[user_id] = np.array([vector_list])
+            self.user_state = {}
+            self._recommendation_cache.clear()
+            user_ids = model_data.get('user_ids', [])
+            if user_ids:
+                self.user_vectors = dict(zip(user_ids, np.load(model_file + USER_MATRIX_SUFFIX)))
             
             logger.info(f"Loaded recommendation model from {model_file}")
             return True
@@ -282,45 +294,95 @@ class RecommendationModel:
             logger.error(f"Error loading recommendation model: {e}")
             return False
     
-    def _update_user_vector(self, user_id: str, history: List[str]):
+    def _update_user_vectors(self, user_histories: Dict[str, List[str]]):
         """
-        Update user vector based on interaction history
+        Update user vectors based on interaction histories
         
         Args:
-            user_id (str): User ID
-            history (list): List of content IDs the user has interacted with
+            user_histories (dict): Dict mapping user IDs to lists of content IDs they've interacted with
         """
         try:
-            # Get content vectors for items in history
-            history_vectors = []
-            for content_id in history:
-                if content_id in self.content_vectors:
-                    history_vectors.append(self.content_vectors[content_id])
+            # Build a sparse user x content incidence matrix from the histories
+            user_ids, seen_sets, indices, indptr = [], [], [], [0]
+            for user_id, history in user_histories.items():
+                seen = {content_id for content_id in history if content_id in self.content_id_to_row}
+                if not seen:
+                    logger.warning(f"No valid content vectors found for user {user_id}'s history")
+                    continue
+                
+                user_ids.append(user_id)
+                seen_sets.append(seen)
+                indices.extend(self.content_id_to_row[content_id] for content_id in seen)
+                indptr.append(len(indices))
             
-            if history_vectors:
-                # Combine vectors (average)
-                user_vector = sum(history_vectors) / len(history_vectors)
-                self.user_vectors[user_id] = user_vector
-            else:
-                logger.warning(f"No valid content vectors found for user {user_id}'s history")
+            if not user_ids:
+                return
+            
+            incidence = sparse.csr_matrix(
+                (np.ones(len(indices), dtype=np.float32), indices, indptr),
+                shape=(len(user_ids), self.content_matrix.shape[0])
+            )
+            
+            # Sum every user's history in one sparse product; normalizing the sum
+            # equals normalizing the average and makes scoring a plain dot product
+            history_sums = (incidence @ self.content_matrix).toarray()
+            user_vectors = normalize(history_sums)
+            
+            for i, user_id in enumerate(user_ids):
+                self.user_state[user_id] = {'sum': history_sums[i], 'seen': seen_sets[i]}
+                self.user_vectors[user_id] = user_vectors[i]
         
         except Exception as e:
-            logger.error(f"Error updating user vector: {e}")
+            logger.error(f"Error updating user vectors: {e}")
     
-    def _get_user_history(self, user_id: str) -> List[str]:
+    def _set_content(self, content_ids, content_matrix):
         """
-        Get user interaction history (this is a placeholder - in a real system, 
-        this would retrieve from a database)
+        Replace the content matrix and its row index
         
         Args:
-            user_id (str): User ID
+            content_ids (iterable): Content IDs, one per matrix row
+            content_matrix (scipy.sparse matrix): L2-normalized content vectors
+        """
+        self.content_id_index = list(content_ids)
+        self.content_id_to_row = {content_id: row for row, content_id in enumerate(self.content_id_index)}
+        self.content_matrix = sparse.csr_matrix(content_matrix)
+    
+    def _top_k(self, scores: np.ndarray, k: int, exclude_ids: Optional[List[str]] = None) -> List[str]:
+        """
+        Select the highest-scoring content IDs
+        
+        Args:
+            scores (np.ndarray): Similarity score per content row (-inf marks skipped rows)
+            k (int): Number of content IDs to select
+            exclude_ids (list, optional): List of content IDs to exclude
             
         Returns:
-            list: List of content IDs the user has interacted with
+            list: Content IDs ordered by descending score
+        """
+        if exclude_ids:
+            excluded_rows = [self.content_id_to_row[content_id] for content_id in exclude_ids
+                             if content_id in self.content_id_to_row]
+            scores[excluded_rows] = -np.inf
+        
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return []
+        
+        # Partial selection is O(N); only the k winners get sorted
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [self.content_id_index[row] for row in top]
+    
+    def _invalidate_recommendations(self, user_id: str):
+        """
+        Drop cached recommendations for a user
+        
+        Args:
+            user_id (str): User ID
         """
-        # This is just a placeholder implementation
-        # In a real system, this would retrieve from a database
-        return []
+        stale_keys = [key for key in self._recommendation_cache if key[0] == user_id]
+        for key in stale_keys:
+            del self._recommendation_cache[key]
     
     def _random_recommendations(self, num_recommendations: int, exclude_ids: Optional[List[str]] = None) -> List[str]:
         """
@@ -334,7 +396,7 @@ class RecommendationModel:
             list: List of random content IDs
         """
         # Get all available content IDs
-        all_ids = list(self.content_vectors.keys())
+        all_ids = list(self.content_id_index)
         
         # Remove excluded IDs
         if exclude_ids:
@@ -1,10 +1,13 @@
-from typing import List, Dict, Any, Optional, Tuple, Union
+from typing import List, Dict, Any, Iterable, Optional, Tuple, Union
 import re
 import nltk
 import logging
+import numpy as np
+import heapq
+import bisect
+import functools
 from collections import Counter
-from sklearn.feature_extraction.text import TfidfVectorizer
-from nltk.tokenize import word_tokenize, sent_tokenize
+from itertools import chain
 from nltk.corpus import stopwords
 
 # Configure logging
@@ -21,6 +24,107 @@ try:
 except LookupError:
     nltk.download('stopwords')
 
+# Runs of letters/digits. Unlike word_tokenize + isalnum(), which dropped the
+# non-alphanumeric pieces, this splits contractions and hyphenated words at the
+# punctuation ("don't" -> "don", "t"; "well-known" -> "well", "known"), so word
+# counts (and the readability scores built on them) run slightly higher
+_WORD_RE = re.compile(r"[^\W_]+")
+
+# Word lists for the simple lexicon-based sentiment analysis
+_POSITIVE_WORDS = frozenset([
+    'good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic',
+    'happy', 'joy', 'love', 'best', 'positive', 'beautiful', 'nice',
+    'awesome', 'superb', 'outstanding', 'perfect', 'ideal', 'impressive'
+])
+
+_NEGATIVE_WORDS = frozenset([
+    'bad', 'terrible', 'awful', 'horrible', 'worst', 'poor', 'negative',
+    'sad', 'hate', 'dislike', 'disappointing', 'failure', 'failed',
+    'problem', 'difficult', 'wrong', 'trouble', 'unfortunate', 'ugly'
+])
+
+# Code points counted as vowels by the syllable estimate
+_VOWEL_CODES = np.array([ord(c) for c in 'aeiou'], dtype=np.uint32)
+
+# Flesch Reading Ease lower bounds (ascending) and the level each band maps to
+_FLESCH_THRESHOLDS = (30, 50, 60, 70, 80, 90)
+_FLESCH_LEVELS = (
+    'Very Difficult', 'Difficult', 'Fairly Difficult', 'Standard',
+    'Fairly Easy', 'Easy', 'Very Easy'
+)
+
+# Language code to NLTK stopword corpus name
+_LANG_MAP = {
+    'en': 'english',
+    'fr': 'french',
+    'es': 'spanish',
+    'de': 'german',
+    'it': 'italian',
+}
+
+@functools.lru_cache(maxsize=1)
+def _sentence_tokenizer():
+    """Load the Punkt sentence tokenizer once instead of resolving it on every sent_tokenize call"""
+    return nltk.data.load('tokenizers/punkt/english.pickle')
+
+@functools.lru_cache(maxsize=None)
+def _stopwords(language: str) -> frozenset:
+    """Load the stopword set for a language once per process"""
+    try:
+        return frozenset(stopwords.words(_LANG_MAP.get(language, language)))
+    except:
+        # Fallback to English if language not available
+        return frozenset(stopwords.words('english'))
+
+@functools.lru_cache(maxsize=256)
+def _extract_keywords_cached(text: str, max_keywords: int, language: str) -> Tuple[Tuple[str, float], ...]:
+    """Score keywords by relative term frequency, memoized per (text, max_keywords, language)"""
+    return _score_keywords(_WORD_RE.findall(text.lower()), max_keywords, language)
+
+def _score_keywords(words: Iterable[str], max_keywords: int, language: str) -> Tuple[Tuple[str, float], ...]:
+    """Score already tokenized, lowercased words by relative term frequency"""
+    # Remove stopwords
+    stop_words = _stopwords(language)
+    words = [word for word in words if word not in stop_words]
+    
+    # Calculate word frequencies; TF-IDF over a single-document corpus is just
+    # term frequency, so relative frequency ranks keywords the same way
+    word_freq = Counter(words)
+    total = len(words)
+    if not total:
+        return ()
+    
+    # Filter out single characters and return top keywords
+    filtered_keywords = [(word, count / total) for word, count in word_freq.most_common() if len(word) > 1]
+    
+    return tuple(filtered_keywords[:max_keywords])
+
+def _count_syllables(words: List[str]) -> int:
+    """
+    Estimate syllables as vowels per word (ignoring a trailing 'e'), at least one per word
+    
+    All words are counted in one vectorized pass over their concatenated code points.
+    
+    Args:
+        words (list): Lowercased word tokens
+        
+    Returns:
+        int: Estimated syllable count
+    """
+    if not words:
+        return 0
+    
+    # UTF-32 gives one array element per character, so word offsets index it directly
+    codes = np.frombuffer(''.join(words).encode('utf-32-le'), dtype=np.uint32)
+    lengths = np.fromiter(map(len, words), dtype=np.intp, count=len(words))
+    ends = np.cumsum(lengths)
+    
+    # Vowels per word, minus a trailing (usually silent) 'e'
+    vowel_counts = np.add.reduceat(np.isin(codes, _VOWEL_CODES).astype(np.int32), ends - lengths)
+    vowel_counts -= codes[ends - 1] == ord('e')
+    
+    return int(np.maximum(vowel_counts, 1).sum())
+
 class TextAnalysis:
     """
     Tools for analyzing and extracting information from text content
@@ -29,7 +133,7 @@ class TextAnalysis:
     @staticmethod
     def extract_keywords(text: str, max_keywords: int = 10, language: str = 'english') -> List[Tuple[str, float]]:
         """
-        Extract keywords from text using TF-IDF
+        Extract keywords from text by term frequency
         
         Args:
             text (str): Input text
@@ -40,60 +144,30 @@ class TextAnalysis:
             list: List of (keyword, score) tuples
         """
         try:
-            # Handle language mapping for NLTK
-            lang_map = {
-                'en': 'english',
-                'fr': 'french',
-                'es': 'spanish',
-                'de': 'german',
-                'it': 'italian',
-            }
-            nltk_lang = lang_map.get(language, language)
-            
-            # Get stopwords for the language
-            try:
-                stop_words = set(stopwords.words(nltk_lang))
-            except:
-                # Fallback to English if language not available
-                stop_words = set(stopwords.words('english'))
-            
-            # Tokenize text
-            words = word_tokenize(text.lower())
-            
-            # Remove stopwords and punctuation
-            words = [word for word in words if word.isalnum() and word not in stop_words]
-            
-            # Calculate word frequencies
-            word_freq = Counter(words)
-            
-            # Create a corpus with just this document
-            corpus = [text]
-            
-            # Create TF-IDF vectorizer
-            vectorizer = TfidfVectorizer(
-                max_features=max_keywords*2,  # Extract more than needed to filter later
-                stop_words=nltk_lang
-            )
-            
-            # Get TF-IDF scores
-            tfidf_matrix = vectorizer.fit_transform(corpus)
-            feature_names = vectorizer.get_feature_names_out()
-            
-            # Get scores for the first (and only) document
-            tfidf_scores = zip(feature_names, tfidf_matrix.toarray()[0])
-            
-            # Sort by score and get top keywords
-            sorted_keywords = sorted(tfidf_scores, key=lambda x: x[1], reverse=True)
-            
-            # Filter out single characters and return top keywords
-            filtered_keywords = [(word, score) for word, score in sorted_keywords if len(word) > 1]
-            
-            return filtered_keywords[:max_keywords]
+            return list(_extract_keywords_cached(text, max_keywords, language))
         
         except Exception as e:
             logger.error(f"Error extracting keywords: {e}")
             return []
     
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _tokenize_once(text: str) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, ...], ...]]:
+        """
+        Split text into sentences and lowercased word tokens in a single pass
+        
+        Memoized so analyzing the same text several ways tokenizes it only once.
+        
+        Args:
+            text (str): Input text
+            
+        Returns:
+            tuple: (sentences, word tokens per sentence)
+        """
+        sentences = tuple(_sentence_tokenizer().tokenize(text))
+        sentence_tokens = tuple(tuple(_WORD_RE.findall(sentence.lower())) for sentence in sentences)
+        return sentences, sentence_tokens
+    
     @staticmethod
     def extract_key_sentences(text: str, max_sentences: int = 3) -> List[str]:
         """
@@ -108,22 +182,21 @@ class TextAnalysis:
         """
         try:
             # Split into sentences
-            sentences = sent_tokenize(text)
+            sentences, sentence_tokens = TextAnalysis._tokenize_once(text)
             
             # If few sentences, return all
             if len(sentences) <= max_sentences:
-                return sentences
+                return list(sentences)
             
-            # Create keyword dictionary
-            keywords = TextAnalysis.extract_keywords(text, max_keywords=20)
+            # Create keyword dictionary from the same tokens
+            keywords = _score_keywords(chain.from_iterable(sentence_tokens), 20, 'english')
             keyword_dict = {word: score for word, score in keywords}
             
             # Score sentences based on keywords
             sentence_scores = []
             
-            for sentence in sentences:
+            for words in sentence_tokens:
                 score = 0
-                words = word_tokenize(sentence.lower())
                 
                 for word in words:
                     if word in keyword_dict:
@@ -133,16 +206,13 @@ class TextAnalysis:
                 if len(words) > 0:
                     score = score / len(words)
                 
-                sentence_scores.append((sentence, score))
+                sentence_scores.append(score)
             
-            # Sort by score and get top sentences
-            sorted_sentences = sorted(sentence_scores, key=lambda x: x[1], reverse=True)
-            top_sentences = [sentence for sentence, score in sorted_sentences[:max_sentences]]
+            # Get indices of the top sentences (identical sentences stay distinct)
+            top_indices = heapq.nlargest(max_sentences, range(len(sentences)), key=sentence_scores.__getitem__)
             
             # Return sentences in original order
-            ordered_sentences = [s for s in sentences if s in top_sentences]
-            
-            return ordered_sentences
+            return [sentences[i] for i in sorted(top_indices)]
         
         except Exception as e:
             logger.error(f"Error extracting key sentences: {e}")
@@ -201,20 +271,13 @@ class TextAnalysis:
         """
         try:
             # Count words, sentences, and syllables
-            sentences = sent_tokenize(text)
-            words = word_tokenize(text)
-            word_count = len([w for w in words if w.isalnum()])
+            sentences, sentence_tokens = TextAnalysis._tokenize_once(text)
+            words = list(chain.from_iterable(sentence_tokens))
+            word_count = len(words)
             sentence_count = len(sentences)
             
             # Estimate syllables (simple approximation)
-            syllable_count = 0
-            for word in words:
-                if word.isalnum():
-                    word = word.lower()
-                    if word.endswith('e'):
-                        word = word[:-1]
-                    count = len(re.findall('[aeiou]', word))
-                    syllable_count += max(1, count)
+            syllable_count = _count_syllables(words)
             
             # Calculate metrics
             if sentence_count == 0 or word_count == 0:
@@ -234,20 +297,7 @@ class TextAnalysis:
             flesch = max(0, min(100, flesch))  # Clamp to 0-100
             
             # Determine readability level
-            if flesch >= 90:
-                level = 'Very Easy'
-            elif flesch >= 80:
-                level = 'Easy'
-            elif flesch >= 70:
-                level = 'Fairly Easy'
-            elif flesch >= 60:
-                level = 'Standard'
-            elif flesch >= 50:
-                level = 'Fairly Difficult'
-            elif flesch >= 30:
-                level = 'Difficult'
-            else:
-                level = 'Very Difficult'
+            level = _FLESCH_LEVELS[bisect.bisect_right(_FLESCH_THRESHOLDS, flesch)]
             
             return {
                 'word_count': word_count,
@@ -282,25 +332,12 @@ class TextAnalysis:
             # This is a very simple implementation
             # In a real application, use a proper NLP library or service
             
-            # Load positive and negative word lists
-            positive_words = set([
-                'good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic',
-                'happy', 'joy', 'love', 'best', 'positive', 'beautiful', 'nice',
-                'awesome', 'superb', 'outstanding', 'perfect', 'ideal', 'impressive'
-            ])
-            
-            negative_words = set([
-                'bad', 'terrible', 'awful', 'horrible', 'worst', 'poor', 'negative',
-                'sad', 'hate', 'dislike', 'disappointing', 'failure', 'failed',
-                'problem', 'difficult', 'wrong', 'trouble', 'unfortunate', 'ugly'
-            ])
-            
-            # Tokenize and normalize
-            words = word_tokenize(text.lower())
+            # Tokenize, normalize and count each distinct word once
+            word_counts = Counter(_WORD_RE.findall(text.lower()))
             
             # Count positive and negative words
-            positive_count = sum(1 for word in words if word in positive_words)
-            negative_count = sum(1 for word in words if word in negative_words)
+            positive_count = sum(word_counts[word] for word in _POSITIVE_WORDS & word_counts.keys())
+            negative_count = sum(word_counts[word] for word in _NEGATIVE_WORDS & word_counts.keys())
             
             # Calculate sentiment score (-1 to 1)
             total_count = positive_count + negative_count
@@ -9,7 +9,7 @@ from streamlit_extras.switch_page_button import switch_page
 from streamlit_extras.let_it_rain import rain
 
 from utils.llm_utils import generate_learning_snippet
-from utils.audio_utils import generate_audio, get_audio_duration
+from utils.audio_cache import get_or_synthesize
 from utils.data_utils import track_event, save_audio_metadata
 from utils.language_utils import get_translation, get_languages_for_display
 from components.audio_player import AudioPlayer
@@ -243,7 +243,7 @@ def app():
                         # Generate audio if not already generated
                         if not st.session_state.create_form_state['generated_audio_path']:
                             with st.spinner(get_translation('generating_audio', st.session_state.language)):
-                                audio_path = generate_audio(
+                                audio_path, duration = get_or_synthesize(
                                     snippet['content'],
                                     snippet['title'],
                                     selected_language,
@@ -251,9 +251,6 @@ def app():
                                 )
                                 
                                 if audio_path:
-                                    # Get audio duration
-                                    duration = get_audio_duration(audio_path)
-                                    
                                     # Save audio metadata
                                     audio_metadata = save_audio_metadata(snippet['id'], audio_path, duration)
                                     
@@ -319,7 +316,7 @@ def app():
             # Generate audio if not already generated
             if st.session_state.create_form_state['audio_generating'] and not st.session_state.create_form_state['generated_audio_path']:
                 with st.spinner(get_translation('generating_audio', st.session_state.language)):
-                    audio_path = generate_audio(
+                    audio_path, duration = get_or_synthesize(
                         snippet['content'],
                         snippet['title'],
                         selected_language,
@@ -327,9 +324,6 @@ def app():
                     )
                     
                     if audio_path:
-                        # Get audio duration
-                        duration = get_audio_duration(audio_path)
-                        
                         # Save audio metadata
                         audio_metadata = save_audio_metadata(snippet['id'], audio_path, duration)
                         
@@ -370,7 +364,8 @@ def app():
                 audio_player = AudioPlayer()
                 audio_player.render(
                     audio_path=st.session_state.create_form_state['generated_audio_path'],
-                    title=snippet['title']
+                    title=snippet['title'],
+                    duration=snippet.get('audio_duration')
                 )
     
     # Reset button at the bottom
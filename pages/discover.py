@@ -1,4 +1,5 @@
 import streamlit as st
+import os
 import asyncio
 import time
 import pandas as pd
@@ -10,14 +11,20 @@ from streamlit_lottie import st_lottie
 import requests
 import json
 import random
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from utils.llm_utils import generate_learning_snippet, generate_recommendation
-from utils.audio_utils import generate_audio, get_audio_duration
+from utils.llm_utils import generate_learning_snippet, generate_recommendation, SnippetStream
+from utils.audio_utils import generate_audio_from_stream, get_audio_duration
+from utils.audio_cache import get_or_synthesize
 from utils.data_utils import track_event, save_audio_metadata
 from utils.language_utils import get_translation
 from templates.recommendation_templates import get_trending_topics, get_topic_categories, get_curated_playlists
 from config import DEFAULT_SNIPPET_DURATION
 
+# Upper bound on concurrent LLM/TTS requests when adding several topics
+MAX_GENERATION_WORKERS = 8
+
 def app():
     """Discover page with topic recommendations and exploration tools"""
     
@@ -86,16 +93,21 @@ def display_categories():
     # Get categories for the current language
     categories = get_topic_categories(st.session_state.language)
     
-    # Create tabs for each category
-    category_tabs = st.tabs(list(categories.keys()))
+    # Category picker; unlike st.tabs (which builds every tab's widgets on
+    # every rerun), only the selected category's topic grid is rendered
+    category = st.radio(
+        "Category",
+        options=list(categories),
+        horizontal=True,
+        label_visibility="collapsed",
+        key="discover_category"
+    )
+    
+    # Display category description
+    st.markdown(get_category_description(category))
     
-    for i, (category, topics) in enumerate(categories.items()):
-        with category_tabs[i]:
-            # Display category description
-            st.markdown(get_category_description(category))
-            
-            # Display topics with visual cards
-            display_topics_grid(topics, 3, key_prefix=f"category_{category}")
+    # Display topics with visual cards
+    display_topics_grid(categories[category], 3, key_prefix=f"category_{category}")
 
 def display_trending_topics():
     """Display trending topics"""
@@ -159,6 +171,9 @@ def display_trending_topics():
 def display_curated_playlists():
     """Display curated playlists"""
     
+    # Bind the current language once for all translated labels
+    t = partial(get_translation, language=st.session_state.language)
+    
     # Get curated playlists for the current language
     curated = get_curated_playlists(st.session_state.language)
     
@@ -178,7 +193,7 @@ def display_curated_playlists():
             
             with col1:
                 # Preview button shows topics in a more visual way
-                if st.button(get_translation('preview', st.session_state.language), key=f"preview_{playlist_name}"):
+                if st.button(t('preview'), key=f"preview_{playlist_name}"):
                     st.session_state.preview_playlist = {
                         'name': playlist_name,
                         'topics': topics
@@ -187,8 +202,8 @@ def display_curated_playlists():
             
             with col2:
                 # Add all button adds all topics to the playlist
-                if st.button(get_translation('add_all', st.session_state.language), key=f"add_all_{playlist_name}"):
-                    with st.spinner(get_translation('generating_snippets', st.session_state.language)):
+                if st.button(t('add_all'), key=f"add_all_{playlist_name}"):
+                    with st.spinner(t('generating_snippets')):
                         add_topics_to_playlist(topics)
                         
                         # Track event
@@ -215,8 +230,8 @@ def display_curated_playlists():
         display_topics_grid(st.session_state.preview_playlist['topics'], 4, key_prefix=f"preview_{st.session_state.preview_playlist['name']}")
         
         # Add button to add all from preview
-        if st.button(get_translation('add_all_from_preview', st.session_state.language)):
-            with st.spinner(get_translation('generating_snippets', st.session_state.language)):
+        if st.button(t('add_all_from_preview')):
+            with st.spinner(t('generating_snippets')):
                 add_topics_to_playlist(st.session_state.preview_playlist['topics'])
                 
                 # Close preview
@@ -224,7 +239,7 @@ def display_curated_playlists():
                 st.rerun()
         
         # Close preview
-        if st.button(get_translation('close_preview', st.session_state.language)):
+        if st.button(t('close_preview')):
             st.session_state.pop('preview_playlist')
             st.rerun()
 
@@ -247,9 +262,11 @@ def display_interactive_explorer():
     col1, col2 = st.columns([3, 1])
     
     with col1:
+        # Bound by key so callbacks can set it without a rerun; Streamlit drops
+        # the key while the page is not rendered, so restore it from explorer_state
+        st.session_state.setdefault("explorer_seed", st.session_state.explorer_state['seed_topic'])
         seed_topic = st.text_input(
             get_translation('enter_topic', st.session_state.language),
-            value=st.session_state.explorer_state['seed_topic'],
             key="explorer_seed"
         )
     
@@ -263,6 +280,12 @@ def display_interactive_explorer():
                 with st.spinner(get_translation('generating_recommendations', st.session_state.language)):
                     run_interactive_exploration(seed_topic)
     
+    # Explore a topic queued by an "explore this" / "jump back" click
+    pending_topic = st.session_state.explorer_state.pop('pending_topic', None)
+    if pending_topic:
+        with st.spinner(get_translation('exploring', st.session_state.language)):
+            run_interactive_exploration(pending_topic)
+    
     # Display recommendations
     if st.session_state.explorer_state['recommendations']:
         st.divider()
@@ -291,18 +314,42 @@ def display_interactive_explorer():
             
             with col2:
                 if i < len(history) - 1:  # Not the current topic
-                    if st.button(get_translation('jump_back', st.session_state.language), key=f"jump_{i}"):
-                        # Truncate history and re-explore
-                        st.session_state.explorer_state['history'] = history[:i+1]
-                        st.session_state.explorer_state['seed_topic'] = topic
-                        run_interactive_exploration(topic)
-                        st.rerun()
+                    # Truncate history and re-explore
+                    st.button(
+                        get_translation('jump_back', st.session_state.language), 
+                        key=f"jump_{i}",
+                        on_click=_queue_exploration,
+                        args=(topic, history[:i+1])
+                    )
+
+def _queue_exploration(topic, history=None):
+    """
+    Button callback: make topic the explorer seed and queue it for exploration
+    
+    Runs before the rerun the click triggers, so the seed input and history
+    render updated without an extra st.rerun().
+    
+    Args:
+        topic (str): Topic to explore
+        history (list, optional): Replacement history (topic is appended if None)
+    """
+    explorer_state = st.session_state.explorer_state
+    if history is None:
+        explorer_state['history'].append(topic)
+    else:
+        explorer_state['history'] = history
+    explorer_state['seed_topic'] = topic
+    explorer_state['pending_topic'] = topic
+    st.session_state.explorer_seed = topic
 
 def display_learning_paths():
     """Display learning paths for guided learning"""
     
-    st.subheader("🛤️ " + get_translation('learning_paths', st.session_state.language))
-    st.markdown(get_translation('learning_paths_description', st.session_state.language))
+    # Bind the current language once for all translated labels
+    t = partial(get_translation, language=st.session_state.language)
+    
+    st.subheader("🛤️ " + t('learning_paths'))
+    st.markdown(t('learning_paths_description'))
     
     # Define some learning paths
     learning_paths = {
@@ -360,8 +407,8 @@ def display_learning_paths():
                 st.markdown(f"**Step {j+1}:** {topic}")
             
             # Add button for this path
-            if st.button(get_translation('start_path', st.session_state.language), key=f"path_{i}"):
-                with st.spinner(get_translation('preparing_path', st.session_state.language)):
+            if st.button(t('start_path'), key=f"path_{i}"):
+                with st.spinner(t('preparing_path')):
                     # Generate first topic in the path
                     add_topics_to_playlist([topics[0]])
                     
@@ -373,7 +420,7 @@ def display_learning_paths():
                     })
                     
                     # Show success message
-                    st.success(get_translation('path_started', st.session_state.language))
+                    st.success(t('path_started'))
                     
                     # Create a celebratory effect
                     rain(
@@ -386,6 +433,13 @@ def display_learning_paths():
 def display_topics_grid(topics, columns, key_prefix="topic_grid", explorer_mode=False):
     """Display topics in a grid layout with visual cards"""
     
+    # Translate button labels once, not once per topic
+    t = partial(get_translation, language=st.session_state.language)
+    explore_label = t('explore_this')
+    add_to_playlist_label = t('add_to_playlist')
+    add_label = t('add')
+    generating_label = t('generating_snippet')
+    
     # Create columns
     cols = st.columns(columns)
     
@@ -402,113 +456,182 @@ def display_topics_grid(topics, columns, key_prefix="topic_grid", explorer_mode=
             # Add button functionality
             if explorer_mode:
                 # In explorer mode, clicking explores related topics
-                if st.button(get_translation('explore_this', st.session_state.language), key=f"{key_prefix}_explore_topic_{topic}_{i}"):
-                    st.session_state.explorer_state['seed_topic'] = topic
-                    st.session_state.explorer_state['history'].append(topic)
-                    
-                    with st.spinner(get_translation('exploring', st.session_state.language)):
-                        run_interactive_exploration(topic)
-                        st.rerun()
+                st.button(
+                    explore_label, 
+                    key=f"{key_prefix}_explore_topic_{topic}_{i}",
+                    on_click=_queue_exploration,
+                    args=(topic,)
+                )
                 
                 # Add to playlist button
-                if st.button(get_translation('add_to_playlist', st.session_state.language), key=f"{key_prefix}_add_explore_{topic}_{i}"):
-                    with st.spinner(get_translation('generating_snippet', st.session_state.language)):
+                if st.button(add_to_playlist_label, key=f"{key_prefix}_add_explore_{topic}_{i}"):
+                    with st.spinner(generating_label):
                         add_topics_to_playlist([topic])
             else:
                 # Regular add button
-                if st.button(get_translation('add', st.session_state.language), key=f"{key_prefix}_add_topic_{topic}_{i}"):
-                    with st.spinner(get_translation('generating_snippet', st.session_state.language)):
+                if st.button(add_label, key=f"{key_prefix}_add_topic_{topic}_{i}"):
+                    with st.spinner(generating_label):
                         add_topics_to_playlist([topic])
 
+def _produce_snippet(topic, language):
+    """
+    Generate a snippet and its audio for one topic (runs on a worker thread)
+    
+    The LLM response is streamed and each sentence is fed to TTS while the
+    rest is still being generated, so audio synthesis overlaps with text
+    generation instead of waiting for it.
+    
+    Args:
+        topic (str): Topic to generate
+        language (str): Language code
+        
+    Returns:
+        tuple: (snippet, audio_path, duration); missing parts are None
+    """
+    stream = SnippetStream(topic, DEFAULT_SNIPPET_DURATION, language)
+    audio_path = None
+    
+    if not stream.cached:
+        audio_path = generate_audio_from_stream(stream, language)
+    
+    snippet = stream.snippet
+    if snippet is None:
+        # Streaming was interrupted before the snippet was assembled
+        snippet = asyncio.run(generate_learning_snippet(
+            topic, 
+            DEFAULT_SNIPPET_DURATION, 
+            language
+        ))
+    
+    if not snippet:
+        return None, None, None
+    
+    if audio_path and snippet.get('error'):
+        # Audio of a partial response; regenerate from the error snippet below
+        os.remove(audio_path)
+        audio_path = None
+    
+    if audio_path:
+        duration = get_audio_duration(audio_path)
+    else:
+        # Cached snippets (and streaming failures) go through generate_audio's cache
+        audio_path, duration = get_or_synthesize(snippet['content'], snippet['title'], language)
+    
+    if not audio_path:
+        return snippet, None, None
+    
+    return snippet, audio_path, duration
+
+@st.cache_resource(show_spinner=False)
+def _generation_executor():
+    """Long-lived worker pool shared by all sessions (threads are reused, not respawned)"""
+    return ThreadPoolExecutor(max_workers=MAX_GENERATION_WORKERS, thread_name_prefix="snippet-gen")
+
+def _normalize_topic(topic):
+    """Normalize a topic for duplicate detection"""
+    return ' '.join(topic.split()).casefold()
+
 def add_topics_to_playlist(topics):
     """Add topics to the playlist"""
     
+    language = st.session_state.language
+    
     # Track event
     track_event("topics_added", {
         "topic_count": len(topics),
         "topics": topics,
-        "language": st.session_state.language
+        "language": language
     })
     
-    # Run loop to handle async function
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    # Drop repeated topics and topics already in the playlist before doing
+    # any LLM/TTS work (compared case- and whitespace-insensitively)
+    existing = {
+        _normalize_topic(snippet.get('topic', ''))
+        for snippet in st.session_state.get('current_playlist', [])
+    }
+    unique_topics = {}
+    skipped = []
+    for topic in topics:
+        key = _normalize_topic(topic)
+        if key in existing or key in unique_topics:
+            skipped.append(topic)
+        else:
+            unique_topics[key] = topic
+    topics = list(unique_topics.values())
+    
+    if skipped:
+        skipped_list = ', '.join(f"'{topic}'" for topic in skipped)
+        st.info(f"{skipped_list} {get_translation('already_in_playlist', language)}")
+    
+    if not topics:
+        return True
+    
+    # LLM and TTS calls are network-bound, so fan topics out over a thread pool.
+    # Worker threads must not touch st.*; all UI/session updates happen below
+    # on the script thread, so session state needs no locking.
+    results = [(None, None, None)] * len(topics)
+    progress_bar = st.progress(0.0)
+    
+    executor = _generation_executor()
+    futures = {
+        executor.submit(_produce_snippet, topic, language): i
+        for i, topic in enumerate(topics)
+    }
+    for done, future in enumerate(as_completed(futures), start=1):
+        results[futures[future]] = future.result()
+        progress_bar.progress(done / len(topics))
     
-    try:
-        # Create snippets for each topic
-        for topic in topics:
-            with st.spinner(f"{get_translation('generating_snippet', st.session_state.language)} {topic}..."):
-                # Generate snippet
-                snippet = loop.run_until_complete(generate_learning_snippet(
-                    topic, 
-                    DEFAULT_SNIPPET_DURATION, 
-                    st.session_state.language
-                ))
-                
-                if snippet:
-                    # Generate audio
-                    audio_path = generate_audio(
-                        snippet['content'], 
-                        snippet['title'], 
-                        st.session_state.language
-                    )
-                    
-                    if audio_path:
-                        # Get audio duration
-                        duration = get_audio_duration(audio_path)
-                        
-                        # Save audio metadata
-                        audio_metadata = save_audio_metadata(snippet['id'], audio_path, duration)
-                        
-                        # Update snippet with audio information
-                        snippet['audio_path'] = audio_path
-                        snippet['audio_duration'] = duration
-                        
-                        # Add to playlist and session
-                        if 'current_playlist' in st.session_state:
-                            st.session_state.current_playlist.append(snippet)
-                        else:
-                            st.session_state.current_playlist = [snippet]
-                            
-                        # Add to session
-                        st.session_state.session.add_snippet(snippet)
-                        
-                        # Show success message
-                        st.success(f"'{topic}' {get_translation('added_to_playlist', st.session_state.language)}")
-                    else:
-                        st.error(f"Failed to generate audio for '{topic}'")
-                else:
-                    st.error(f"Failed to generate snippet for '{topic}'")
-    finally:
-        loop.close()
+    progress_bar.empty()
+    
+    # Apply results in the original topic order
+    for topic, (snippet, audio_path, duration) in zip(topics, results):
+        if not snippet:
+            st.error(f"Failed to generate snippet for '{topic}'")
+            continue
+        
+        if not audio_path:
+            st.error(f"Failed to generate audio for '{topic}'")
+            continue
+        
+        # Save audio metadata
+        audio_metadata = save_audio_metadata(snippet['id'], audio_path, duration)
+        
+        # Update snippet with audio information
+        snippet['audio_path'] = audio_path
+        snippet['audio_duration'] = duration
+        
+        # Add to playlist and session
+        if 'current_playlist' in st.session_state:
+            st.session_state.current_playlist.append(snippet)
+        else:
+            st.session_state.current_playlist = [snippet]
+            
+        # Add to session
+        st.session_state.session.add_snippet(snippet)
+        
+        # Show success message
+        st.success(f"'{topic}' {get_translation('added_to_playlist', language)}")
     
     return True
 
 def run_interactive_exploration(topic):
     """Run interactive exploration for a topic"""
     
-    # Run loop to handle async function
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    # Generate recommendations (successful results are cached on disk by generate_recommendation)
+    recommendations = asyncio.run(generate_recommendation(
+        [topic], 
+        6, 
+        st.session_state.language
+    ))
     
-    try:
-        # Generate recommendations
-        recommendations = loop.run_until_complete(generate_recommendation(
-            [topic], 
-            6, 
-            st.session_state.language
-        ))
-        
-        # Update explorer state
-        st.session_state.explorer_state['recommendations'] = recommendations
-        
-        # Track event
-        track_event("topic_explored", {
-            "topic": topic,
-            "language": st.session_state.language
-        })
-    finally:
-        loop.close()
+    # Update explorer state
+    st.session_state.explorer_state['recommendations'] = recommendations
+    
+    # Track event
+    track_event("topic_explored", {
+        "topic": topic,
+        "language": st.session_state.language
+    })
     
     return True
 
@@ -17,6 +17,12 @@ from utils.data_utils import track_event
 from utils.llm_utils import generate_summary, extract_keywords
 import config
 
+@st.cache_data(show_spinner=False, max_entries=64)
+def _read_audio_bytes(path, mtime):
+    """Read an audio file once per (path, mtime) instead of on every rerun"""
+    with open(path, 'rb', buffering=config.AUDIO_IO_BUFFER_SIZE) as f:
+        return f.read()
+
 def app():
     """Library page showing user's learning content"""
     
@@ -314,13 +320,15 @@ def display_list_view(playlist):
                         st.rerun()
                 
                 # Download button
-                st.download_button(
-                    label="⬇️ Download",
-                    data=open(snippet.get('audio_path', ''), 'rb'),
-                    file_name=f"{snippet.get('title', 'audio')}.mp3",
-                    mime="audio/mp3",
-                    key=f"download_{snippet['id']}"
-                )
+                audio_path = snippet.get('audio_path', '')
+                if audio_path and os.path.exists(audio_path):
+                    st.download_button(
+                        label="⬇️ Download",
+                        data=_read_audio_bytes(audio_path, os.path.getmtime(audio_path)),
+                        file_name=f"{snippet.get('title', 'audio')}.mp3",
+                        mime="audio/mp3",
+                        key=f"download_{snippet['id']}"
+                    )
                 
                 # Share button
                 if config.ENABLE_SOCIAL_SHARING:
@@ -474,13 +482,14 @@ def display_detailed_view(snippet):
     else:
         download_path = snippet.get('audio_path', '')
     
-    st.sidebar.download_button(
-        label="Download Audio",
-        data=open(download_path, 'rb'),
-        file_name=f"{snippet.get('title', 'audio')}.{selected_format}",
-        mime=f"audio/{selected_format}",
-        key=f"download_detailed_{snippet['id']}"
-    )
+    if download_path and os.path.exists(download_path):
+        st.sidebar.download_button(
+            label="Download Audio",
+            data=_read_audio_bytes(download_path, os.path.getmtime(download_path)),
+            file_name=f"{snippet.get('title', 'audio')}.{selected_format}",
+            mime=f"audio/{selected_format}",
+            key=f"download_detailed_{snippet['id']}"
+        )
     
     # Main content area
     tab1, tab2, tab3 = st.tabs(["Content", "Analysis", "Share"])
@@ -1,6 +1,8 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
+import functools
 import random
 
+@functools.lru_cache(maxsize=None)
 def get_topic_categories(language: str = 'en') -> Dict[str, List[str]]:
     """
     Get topic categories with examples
@@ -9,7 +11,7 @@ def get_topic_categories(language: str = 'en') -> Dict[str, List[str]]:
         language (str): Language code
         
     Returns:
-        dict: Dictionary of categories and topics
+        dict: Dictionary of categories and topics (cached per language, do not mutate)
     """
     categories = {
         'en': {
@@ -239,15 +241,16 @@ def get_topic_categories(language: str = 'en') -> Dict[str, List[str]]:
     # Default to English if language not available
     return categories.get(language, categories['en'])
 
-def get_trending_topics(language: str = 'en') -> List[str]:
+@functools.lru_cache(maxsize=None)
+def _trending_topic_table(language: str) -> Tuple[str, ...]:
     """
-    Get trending topics
+    Get the fixed trending topic table for a language
     
     Args:
         language (str): Language code
         
     Returns:
-        list: List of trending topics
+        tuple: Trending topics in table order (cached per language)
     """
     topics = {
         'en': [
@@ -304,12 +307,22 @@ def get_trending_topics(language: str = 'en') -> List[str]:
     }
     
     # Default to English if language not available
-    topic_list = topics.get(language, topics['en'])
+    return tuple(topics.get(language, topics['en']))
+
+def get_trending_topics(language: str = 'en') -> List[str]:
+    """
+    Get trending topics
     
-    # Randomize the order for variety
-    random.shuffle(topic_list)
+    Args:
+        language (str): Language code
+        
+    Returns:
+        list: List of trending topics
+    """
+    table = _trending_topic_table(language)
     
-    return topic_list
+    # Randomize the order for variety (a fresh list on every call)
+    return random.sample(table, len(table))
 
 def get_curated_playlists(language: str = 'en') -> Dict[str, List[str]]:
     """
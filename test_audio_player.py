@@ -0,0 +1,46 @@
+import unittest
+from unittest import mock
+
+import streamlit as st
+
+from components.audio_player import PlaylistPlayer
+
+class PlaylistShuffleTest(unittest.TestCase):
+    """Test PlaylistPlayer's in-place shuffle"""
+
+    def setUp(self):
+        # Outside `streamlit run` session state does not persist between
+        # accesses, so a plain dict stands in for it
+        patcher = mock.patch.object(st, "session_state", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.tracks = [{"title": f"Track {i}", "audio_path": f"track_{i}.mp3"} for i in range(10)]
+        self.player = PlaylistPlayer(key_prefix="test_playlist")
+        self.player.set_playlist(list(self.tracks))
+
+    def test_current_track_first_and_rest_permuted(self):
+        """The playing track moves to the front; the others are a permutation"""
+        for current_index in (0, 4, 9):
+            self.player.set_playlist(list(self.tracks))
+            st.session_state["test_playlist_current_index"] = current_index
+
+            self.player._shuffle_playlist()
+
+            playlist = self.player.playlist
+            self.assertIs(playlist[0], self.tracks[current_index])
+            self.assertCountEqual(
+                [track["title"] for track in playlist[1:]],
+                [track["title"] for i, track in enumerate(self.tracks) if i != current_index]
+            )
+            self.assertEqual(st.session_state["test_playlist_current_index"], 0)
+
+    def test_short_playlists_unchanged(self):
+        """Empty and single-track playlists are left alone"""
+        for tracks in ([], self.tracks[:1]):
+            self.player.set_playlist(list(tracks))
+            self.player._shuffle_playlist()
+            self.assertEqual(self.player.playlist, tracks)
+
+if __name__ == "__main__":
+    unittest.main()
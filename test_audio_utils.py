@@ -0,0 +1,108 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from pydub import AudioSegment
+
+from utils import audio_utils
+from utils.audio_utils import generate_audio_from_stream, MIN_STREAM_CHUNK_CHARS
+
+class FakeEngine:
+    """Stand-in AudioEngine that writes a short silent clip per chunk"""
+
+    texts = []
+    fail_on = None
+
+    def __init__(self, language, voice_index, premium):
+        pass
+
+    async def generate_audio(self, text, output_file):
+        FakeEngine.texts.append(text)
+        if len(FakeEngine.texts) == FakeEngine.fail_on:
+            return False
+        AudioSegment.silent(duration=500).export(output_file, format="wav")
+        return True
+
+class GenerateAudioFromStreamTest(unittest.TestCase):
+    """Test chunk batching and failure handling of streamed TTS"""
+
+    def setUp(self):
+        self.audio_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.audio_dir, ignore_errors=True)
+
+        FakeEngine.texts = []
+        FakeEngine.fail_on = None
+
+        for patcher in (
+            mock.patch.object(audio_utils, "AudioEngine", FakeEngine),
+            mock.patch.object(audio_utils, "AUDIO_DIR", self.audio_dir),
+            mock.patch.object(audio_utils, "clean_text_for_tts", lambda text, language: text),
+            mock.patch.object(audio_utils, "enhance_audio", lambda filepath, **kwargs: filepath),
+            mock.patch.object(audio_utils, "compress_audio", lambda filepath, **kwargs: filepath),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _generate(self, text_chunks):
+        return generate_audio_from_stream(text_chunks, format="wav")
+
+    def test_chunks_are_batched(self):
+        """Text is handed to TTS in batches of at least MIN_STREAM_CHUNK_CHARS"""
+        sentences = [f"{i}" * 100 for i in range(7)]
+
+        filepath = self._generate(iter(sentences))
+
+        self.assertEqual(MIN_STREAM_CHUNK_CHARS, 300)
+        self.assertEqual(FakeEngine.texts, [
+            "\n".join(sentences[0:3]),
+            "\n".join(sentences[3:6]),
+            sentences[6],
+        ])
+        self.assertTrue(os.path.exists(filepath))
+        # Chunk files are removed once joined; only the final file remains
+        self.assertEqual(os.listdir(self.audio_dir), [os.path.basename(filepath)])
+
+    def test_short_text_is_one_chunk(self):
+        """Text shorter than a batch is still synthesized"""
+        filepath = self._generate(["Hello.", "World."])
+
+        self.assertEqual(FakeEngine.texts, ["Hello.\nWorld."])
+        self.assertIsNotNone(filepath)
+
+    def test_empty_stream_fails(self):
+        """A stream that yields nothing produces no audio"""
+        self.assertIsNone(self._generate(iter([])))
+        self.assertEqual(FakeEngine.texts, [])
+
+    def test_worker_error_stops_synthesis(self):
+        """Once a chunk fails the rest are skipped and None is returned"""
+        FakeEngine.fail_on = 1
+
+        filepath = self._generate(["x" * 300, "y" * 300, "z" * 300])
+
+        self.assertIsNone(filepath)
+        self.assertEqual(FakeEngine.texts, ["x" * 300])
+        self.assertEqual(os.listdir(self.audio_dir), [])
+
+    def test_source_error_does_not_hang(self):
+        """A text stream that raises partway returns None without hanging"""
+        def text_chunks():
+            yield "x" * 300
+            raise RuntimeError("LLM stream dropped")
+
+        threads_before = threading.active_count()
+        result = {}
+        runner = threading.Thread(target=lambda: result.setdefault("path", self._generate(text_chunks())))
+        runner.start()
+        runner.join(timeout=5)
+
+        self.assertFalse(runner.is_alive())
+        self.assertIsNone(result["path"])
+        # The TTS worker has been joined as well
+        self.assertEqual(threading.active_count(), threads_before)
+
+if __name__ == "__main__":
+    unittest.main()
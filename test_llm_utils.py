@@ -0,0 +1,155 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import config
+
+# The module builds its Groq client on import, which needs some API key
+with mock.patch.object(config, "GROQ_API_KEY", config.GROQ_API_KEY or "test-key"):
+    from utils import llm_utils
+
+from utils.llm_utils import SnippetStream, generate_learning_snippet
+
+CONTENT = (
+    "# The Water Cycle\n"
+    "Water evaporates from oceans. It rises and cools!\n\n"
+    "Clouds form from droplets. Does rain follow? Yes, it does."
+)
+
+# Keys that differ between any two generated snippets
+VOLATILE_KEYS = {"id", "created_at", "created_date"}
+
+def _deltas(text, size=7):
+    """Split text into LLM-sized deltas that cut across sentences"""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+class LLMTestCase(unittest.TestCase):
+    """Base case with the LLM and the snippet cache stubbed out"""
+
+    def setUp(self):
+        self.saved = []
+        manager = llm_utils.content_manager
+        for patcher in (
+            mock.patch.object(manager, "_check_cache", return_value=None),
+            mock.patch.object(manager, "_save_cache", side_effect=lambda key, value: self.saved.append(value)),
+            mock.patch.object(manager, "stream_content", side_effect=lambda **kwargs: iter(_deltas(CONTENT))),
+            mock.patch.object(manager, "generate_content", new=mock.AsyncMock(return_value=CONTENT)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+class SnippetStreamTest(LLMTestCase):
+    """Test SnippetStream against generate_learning_snippet"""
+
+    def test_yields_sentences(self):
+        """Deltas are regrouped into whole sentences and paragraphs"""
+        sentences = list(SnippetStream("Water"))
+
+        self.assertEqual(sentences, [
+            "# The Water Cycle\nWater evaporates from oceans.",
+            "It rises and cools!",
+            "Clouds form from droplets.",
+            "Does rain follow?",
+            "Yes, it does.",
+        ])
+
+    def test_snippet_matches_generate_learning_snippet(self):
+        """The streamed snippet is the dict the non-streaming path builds"""
+        stream = SnippetStream("Water", duration_minutes=3, language="en")
+        list(stream)
+        expected = asyncio.run(generate_learning_snippet("Water", duration_minutes=3, language="en"))
+
+        streamed = {k: v for k, v in stream.snippet.items() if k not in VOLATILE_KEYS}
+        generated = {k: v for k, v in expected.items() if k not in VOLATILE_KEYS}
+        self.assertEqual(streamed, generated)
+        self.assertEqual(set(stream.snippet), set(expected))
+        self.assertEqual(streamed["title"], "The Water Cycle")
+
+        # Both are cached under the same key
+        self.assertEqual(
+            llm_utils.content_manager._save_cache.call_args_list[0].args[0],
+            llm_utils.content_manager._save_cache.call_args_list[1].args[0],
+        )
+
+    def test_cached_snippet_yields_nothing(self):
+        """A cached snippet is returned as-is without calling the LLM"""
+        cached = {"id": "cached", "title": "Cached"}
+        llm_utils.content_manager._check_cache.return_value = cached
+
+        stream = SnippetStream("Water")
+
+        self.assertTrue(stream.cached)
+        self.assertEqual(list(stream), [])
+        self.assertIs(stream.snippet, cached)
+        llm_utils.content_manager.stream_content.assert_not_called()
+
+    def test_stream_error_gives_error_snippet(self):
+        """An LLM stream that raises partway ends iteration with an error snippet"""
+        def broken_stream(**kwargs):
+            yield "First sentence. Second "
+            raise RuntimeError("connection reset")
+
+        llm_utils.content_manager.stream_content.side_effect = broken_stream
+        stream = SnippetStream("Water")
+
+        self.assertEqual(list(stream), ["First sentence."])
+        self.assertTrue(stream.snippet["error"])
+        self.assertEqual(self.saved, [])
+
+class ListItemRegexTest(unittest.TestCase):
+    """Test the list-line regex used to parse recommendations"""
+
+    def test_bullets_and_numbers(self):
+        """Bullet and numbered lines are captured without their markers"""
+        content = (
+            "Here are some topics:\n"
+            "- Photosynthesis\n"
+            "* Plate tectonics  \n"
+            "  3. Black holes\n"
+            "4) Game theory\n"
+        )
+
+        self.assertEqual(llm_utils._LIST_ITEM_RE.findall(content), [
+            "Photosynthesis", "Plate tectonics", "Black holes", "Game theory",
+        ])
+
+    def test_prose_is_ignored(self):
+        """Lines without a list marker, or with no space after it, do not match"""
+        content = "Intro line\n-not a bullet\n3.14 is pi\nA - B"
+
+        self.assertEqual(llm_utils._LIST_ITEM_RE.findall(content), [])
+
+class GenerateRecommendationTest(LLMTestCase):
+    """Test recommendation parsing end to end with a stubbed LLM"""
+
+    def _recommend(self, content, count=3):
+        llm_utils.content_manager.generate_content.return_value = content
+        return asyncio.run(llm_utils.generate_recommendation(["Biology"], count=count))
+
+    def test_inline_numbered_regex(self):
+        """Numbered items run together on one line are split apart"""
+        self.assertEqual(
+            llm_utils._INLINE_NUMBERED_RE.findall("1. Genetics 2. Ecology 3. Evolution"),
+            ["Genetics ", "Ecology ", "Evolution"],
+        )
+
+    def test_duplicates_are_dropped_in_order(self):
+        """Repeated items keep their first position"""
+        content = "- Genetics\n- Ecology\n- Genetics\n- Evolution"
+
+        self.assertEqual(self._recommend(content), ["Genetics", "Ecology", "Evolution"])
+
+    def test_inline_fallback_tops_up(self):
+        """Inline numbered items fill in when too few list lines are found"""
+        content = "Try these: 1. Genetics 2. Ecology 3. Evolution"
+
+        self.assertEqual(self._recommend(content), ["Genetics", "Ecology", "Evolution"])
+
+    def test_result_is_capped_at_count(self):
+        """No more than count recommendations are returned"""
+        content = "- Genetics\n- Ecology\n- Evolution\n- Botany"
+
+        self.assertEqual(self._recommend(content, count=2), ["Genetics", "Ecology"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import time
+import unittest
+from unittest import mock
+
+import streamlit as st
+
+from components.notifications import NotificationManager
+
+class SessionState(dict):
+    """Dict with the attribute access st.session_state offers"""
+
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+class NotificationTestCase(unittest.TestCase):
+    """Base case running NotificationManager against a dict-backed session"""
+
+    def setUp(self):
+        # Outside `streamlit run` session state does not persist between
+        # accesses, so a plain dict stands in for it
+        self.now = 1000.0
+        for patcher in (
+            mock.patch.object(st, "session_state", SessionState()),
+            mock.patch.object(time, "time", lambda: self.now),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.manager = NotificationManager(max_notifications=3)
+
+    def assertUnreadConsistent(self):
+        """The running counter matches a full scan of the notifications"""
+        unread = sum(not notif["read"] for notif in self.manager.get_all())
+        self.assertEqual(self.manager.get_unread_count(), unread)
+        return unread
+
+class UnreadCounterTest(NotificationTestCase):
+    """Test the incrementally maintained unread count"""
+
+    def test_add_and_mark_read(self):
+        """Adding counts up; marking read counts down exactly once"""
+        self.manager.add_info("one")
+        self.manager.add_info("two")
+        self.assertEqual(self.assertUnreadConsistent(), 2)
+
+        first = self.manager.get_all()[0]["id"]
+        self.manager.mark_read(first)
+        self.manager.mark_read(first)
+        self.manager.mark_read("missing")
+        self.assertEqual(self.assertUnreadConsistent(), 1)
+
+    def test_trim_drops_oldest(self):
+        """Trimming past max_notifications uncounts dropped unread items only"""
+        self.manager.add_info("one")
+        self.manager.mark_read(self.manager.get_all()[0]["id"])
+        for message in ("two", "three", "four", "five"):
+            self.manager.add_info(message)
+
+        self.assertEqual([notif["message"] for notif in self.manager.get_all()], ["three", "four", "five"])
+        self.assertEqual(self.manager.get_latest()["message"], "five")
+        self.assertEqual(self.assertUnreadConsistent(), 3)
+
+    def test_remove_mark_all_and_clear(self):
+        """remove, mark_all_read and clear keep the counter in step"""
+        for message in ("one", "two", "three"):
+            self.manager.add_info(message)
+        read_id, unread_id, _ = (notif["id"] for notif in self.manager.get_all())
+        self.manager.mark_read(read_id)
+
+        self.manager.remove(read_id)
+        self.assertEqual(self.assertUnreadConsistent(), 2)
+        self.manager.remove(unread_id)
+        self.manager.remove(unread_id)
+        self.assertEqual(self.assertUnreadConsistent(), 1)
+
+        self.manager.add_info("four")
+        self.manager.mark_all_read()
+        self.assertEqual(self.assertUnreadConsistent(), 0)
+
+        self.manager.add_info("five")
+        self.manager.clear()
+        self.assertEqual(self.manager.get_all(), [])
+        self.assertEqual(self.assertUnreadConsistent(), 0)
+
+class ExpiryHeapTest(NotificationTestCase):
+    """Test auto-dismissal through the expiry heap"""
+
+    def test_only_expired_are_dismissed(self):
+        """Notifications leave in expiry order; persistent ones stay"""
+        self.manager.add_info("long", duration=10)
+        self.manager.add_info("short", duration=2)
+        self.manager.add_info("persistent", duration=0)
+
+        self.now += 2
+        self.manager.auto_dismiss()
+        self.assertEqual([notif["message"] for notif in self.manager.get_all()], ["long", "persistent"])
+        self.assertEqual(self.assertUnreadConsistent(), 2)
+
+        self.now += 8
+        self.manager.auto_dismiss()
+        self.assertEqual([notif["message"] for notif in self.manager.get_all()], ["persistent"])
+        self.assertEqual(st.session_state.notification_expiry, [])
+
+    def test_already_removed_is_a_no_op(self):
+        """Expired entries for removed or trimmed notifications are skipped"""
+        self.manager.add_info("removed", duration=1)
+        self.manager.remove(self.manager.get_all()[0]["id"])
+        self.manager.add_info("kept", duration=0)
+
+        self.now += 5
+        self.manager.auto_dismiss()
+
+        self.assertEqual([notif["message"] for notif in self.manager.get_all()], ["kept"])
+        self.assertEqual(self.assertUnreadConsistent(), 1)
+
+    def test_clear_empties_heap(self):
+        """Nothing expires after a clear"""
+        self.manager.add_info("one", duration=1)
+        self.manager.clear()
+
+        self.assertEqual(st.session_state.notification_expiry, [])
+
+if __name__ == "__main__":
+    unittest.main()
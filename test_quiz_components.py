@@ -0,0 +1,136 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import streamlit as st
+
+import config
+from components import quiz_components
+from components.quiz_components import QuizGenerator
+
+QUESTIONS = [
+    {"id": "q1", "question": "2 + 2?", "options": {"A": "3", "B": "4"}, "answer": "B", "explanation": ""},
+    {"id": "q2", "question": "Capital of France?", "options": {"A": "Paris", "B": "Rome"}, "answer": "A", "explanation": ""},
+]
+
+class QuizTestCase(unittest.TestCase):
+    """Base case running QuizGenerator against a dict-backed session"""
+
+    def setUp(self):
+        """Start every test from an empty session with a signed-in user"""
+        self.state_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.state_dir, ignore_errors=True)
+
+        # Outside `streamlit run` session state does not persist between
+        # accesses, so a plain dict stands in for it
+        for patcher in (
+            mock.patch.object(quiz_components, "QUIZ_STATE_DIR", self.state_dir),
+            mock.patch.object(st, "session_state", {}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self._new_session()
+
+    def _new_session(self):
+        """Simulate a fresh browser session for the same user"""
+        st.session_state.clear()
+        st.session_state["session"] = SimpleNamespace(user_id="user-1")
+
+class QuizSnapshotTest(QuizTestCase):
+    """Test that quiz progress is persisted outside the static tree"""
+
+    def _read_snapshot(self, quiz):
+        with open(quiz._snapshot_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_snapshot_is_not_under_static_dir(self):
+        """Snapshots must never land in the web-servable static tree"""
+        self.assertFalse(
+            os.path.abspath(config.QUIZ_STATE_DIR).startswith(os.path.abspath(config.STATIC_DIR) + os.sep)
+        )
+
+        quiz = QuizGenerator("quiz_test")
+        self.assertTrue(quiz._snapshot_path().startswith(self.state_dir))
+
+    def test_snapshot_round_trip(self):
+        """Progress saved in one session is restored in the next"""
+        quiz = QuizGenerator("quiz_test")
+        quiz.set_questions(QUESTIONS)
+        quiz.record_response("q1", "B")
+        quiz.next_question()
+
+        self._new_session()
+        restored = QuizGenerator("quiz_test")
+
+        self.assertEqual(st.session_state[restored._k_index], 1)
+        self.assertEqual(st.session_state[restored._k_responses], {"q1": "B"})
+        self.assertEqual([q.id for q in st.session_state[restored._k_records]], ["q1", "q2"])
+        self.assertEqual(st.session_state[restored._k_answer_map], {"q1": "B", "q2": "A"})
+
+    def test_restart_rewrites_snapshot(self):
+        """Restarting a completed quiz resets the saved progress too"""
+        quiz = QuizGenerator("quiz_test")
+        quiz.set_questions(QUESTIONS)
+        quiz.record_response("q1", "B")
+        quiz.next_question()
+        quiz.next_question()
+        self.assertTrue(self._read_snapshot(quiz)["completed"])
+
+        quiz.restart()
+
+        snapshot = self._read_snapshot(quiz)
+        self.assertEqual(snapshot["current_index"], 0)
+        self.assertEqual(snapshot["responses"], {})
+        self.assertFalse(snapshot["completed"])
+
+    def test_no_snapshot_without_user(self):
+        """Anonymous sessions are not persisted"""
+        st.session_state.clear()
+        quiz = QuizGenerator("quiz_test")
+        quiz.set_questions(QUESTIONS)
+
+        self.assertIsNone(quiz._snapshot_path())
+        self.assertEqual(os.listdir(self.state_dir), [])
+
+class QuizSubmitTest(QuizTestCase):
+    """Test the Submit Answer button callback"""
+
+    def _submit(self, quiz, question_id, option, on_answer):
+        """Select an option in the question's radio and click Submit"""
+        st.session_state[quiz._question_key(question_id)] = option
+        quiz._submit_answer(question_id, on_answer)
+
+    def test_on_answer_fires_for_every_question(self):
+        """The answer that completes the quiz still reaches on_answer"""
+        answers = []
+        quiz = QuizGenerator("quiz_test")
+        quiz.set_questions(QUESTIONS)
+
+        self._submit(quiz, "q1", "B", lambda *answer: answers.append(answer))
+        self._submit(quiz, "q2", "B", lambda *answer: answers.append(answer))
+
+        self.assertEqual(answers, [("q1", "B"), ("q2", "B")])
+        self.assertTrue(quiz.is_completed())
+        self.assertEqual(quiz.get_score(), 50)
+
+    def test_restart_fires_nothing_stale(self):
+        """No answer from before a restart is replayed afterwards"""
+        answers = []
+        quiz = QuizGenerator("quiz_test")
+        quiz.set_questions(QUESTIONS)
+        self._submit(quiz, "q1", "B", None)
+        self._submit(quiz, "q2", "A", None)
+
+        quiz.restart()
+        self._submit(quiz, "q1", "A", lambda *answer: answers.append(answer))
+
+        self.assertEqual(answers, [("q1", "A")])
+        self.assertEqual(st.session_state[quiz._k_responses], {"q1": "A"})
+
+if __name__ == "__main__":
+    unittest.main()
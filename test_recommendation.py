@@ -0,0 +1,46 @@
+import unittest
+
+import numpy as np
+
+from models.recommendation import RecommendationModel
+
+class TopKTest(unittest.TestCase):
+    """Test partial top-k selection of recommendation scores"""
+
+    def setUp(self):
+        self.model = RecommendationModel()
+        self.model.content_id_index = [f"c{i}" for i in range(8)]
+        self.model.content_id_to_row = {content_id: row for row, content_id in enumerate(self.model.content_id_index)}
+        self.scores = np.array([0.1, 0.9, 0.4, 0.7, 0.2, 0.8, 0.3, 0.6], dtype=np.float32)
+
+    def _sorted_top_k(self, scores, k):
+        """Reference result from a full sort"""
+        order = sorted(range(len(scores)), key=lambda row: -scores[row])
+        return [self.model.content_id_index[row] for row in order if np.isfinite(scores[row])][:k]
+
+    def test_matches_full_sort(self):
+        """Every k gives the same IDs, in the same order, as sorting everything"""
+        for k in range(1, 9):
+            with self.subTest(k=k):
+                self.assertEqual(self.model._top_k(self.scores.copy(), k), self._sorted_top_k(self.scores, k))
+
+    def test_excluded_ids_are_skipped(self):
+        """Excluded IDs never appear and unknown IDs are ignored"""
+        top = self.model._top_k(self.scores.copy(), 3, exclude_ids=["c1", "c5", "missing"])
+
+        self.assertEqual(top, ["c3", "c7", "c2"])
+
+    def test_k_is_clamped_to_finite_scores(self):
+        """Rows already at -inf are not padded into the result"""
+        scores = self.scores.copy()
+        scores[[0, 2, 4, 6]] = -np.inf
+
+        self.assertEqual(self.model._top_k(scores, 10, exclude_ids=["c1"]), ["c5", "c3", "c7"])
+
+    def test_nothing_left(self):
+        """Zero k or all rows excluded returns an empty list"""
+        self.assertEqual(self.model._top_k(self.scores.copy(), 0), [])
+        self.assertEqual(self.model._top_k(self.scores.copy(), 3, exclude_ids=self.model.content_id_index), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import random
+import unittest
+from unittest import mock
+
+from templates import recommendation_templates
+from templates.recommendation_templates import get_trending_topics
+
+class TrendingTopicsTest(unittest.TestCase):
+    """Test that trending topics are reshuffled on every call"""
+
+    def test_each_call_is_a_fresh_shuffle(self):
+        """Calls return new lists in a new order over the same topics"""
+        with mock.patch.object(recommendation_templates, "random", random.Random(0)):
+            first = get_trending_topics('en')
+            second = get_trending_topics('en')
+
+        self.assertIsNot(first, second)
+        self.assertNotEqual(first, second)
+        self.assertEqual(sorted(first), sorted(second))
+
+    def test_mutating_result_does_not_leak(self):
+        """Changing a returned list leaves later calls untouched"""
+        topics = get_trending_topics('fr')
+        topics.clear()
+
+        self.assertEqual(len(get_trending_topics('fr')), 15)
+
+    def test_unknown_language_falls_back_to_english(self):
+        """Languages without a table get the English topics"""
+        self.assertEqual(sorted(get_trending_topics('xx')), sorted(get_trending_topics('en')))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import random
+import re
+import unittest
+
+from models.text_analysis import _WORD_RE, _count_syllables
+
+def _count_syllables_per_word(words):
+    """Reference: the original per-word regex loop"""
+    syllable_count = 0
+    for word in words:
+        if word.endswith('e'):
+            word = word[:-1]
+        count = len(re.findall(r"[aeiou]", word))
+        syllable_count += max(1, count)
+    return syllable_count
+
+class TokenizationTest(unittest.TestCase):
+    """Test the regex word tokenizer shared by the text analyses"""
+
+    def test_contractions_and_hyphens_split_at_punctuation(self):
+        """Pin the tokens for a sentence with contractions and hyphenated words"""
+        sentence = "Don't panic: it's a well-known, user's guide (2nd ed.)"
+
+        self.assertEqual(
+            _WORD_RE.findall(sentence.lower()),
+            ["don", "t", "panic", "it", "s", "a", "well", "known", "user", "s", "guide", "2nd", "ed"]
+        )
+
+    def test_accented_words_stay_whole(self):
+        """Non-ASCII letters are part of words, not separators"""
+        self.assertEqual(_WORD_RE.findall("café déjà-vu über_alles"), ["café", "déjà", "vu", "über", "alles"])
+
+class SyllableCountTest(unittest.TestCase):
+    """Test the vectorized syllable estimate"""
+
+    def test_known_words(self):
+        """Trailing 'e' is silent and every word has at least one syllable"""
+        self.assertEqual(_count_syllables(["e"]), 1)
+        self.assertEqual(_count_syllables(["rhythm"]), 1)
+        self.assertEqual(_count_syllables(["cake"]), 1)
+        self.assertEqual(_count_syllables(["banana"]), 3)
+        self.assertEqual(_count_syllables(["cake", "banana", "e", "rhythm"]), 6)
+
+    def test_empty(self):
+        """No words means no syllables"""
+        self.assertEqual(_count_syllables([]), 0)
+
+    def test_non_ascii_words_keep_offsets(self):
+        """Multi-byte characters do not shift later words"""
+        words = ["café", "déjà", "über", "née", "see"]
+        self.assertEqual(_count_syllables(words), _count_syllables_per_word(words))
+
+    def test_matches_per_word_loop(self):
+        """Random word lists give the same total as the original loop"""
+        rng = random.Random(0)
+        alphabet = "aeioubcdfghlmnrstyéü2"
+        for _ in range(200):
+            words = ["".join(rng.choices(alphabet, k=rng.randint(1, 10))) for _ in range(rng.randint(1, 30))]
+            with self.subTest(words=words):
+                self.assertEqual(_count_syllables(words), _count_syllables_per_word(words))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import logging
+
+from utils.audio_utils import generate_audio, get_audio_duration
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def get_or_synthesize(content, title, language='en', voice_index=0):
+    """
+    Return audio for the given text along with its duration
+
+    generate_audio's file cache (keyed on the cleaned title and text, language
+    and voice) is the only audio cache, so a repeat request skips synthesis and
+    the duration comes from the memoized probe.
+
+    Args:
+        content (str): Text content to convert to speech
+        title (str): Title of the audio
+        language (str): Language code
+        voice_index (int): Index of voice to use
+
+    Returns:
+        tuple: (audio path, duration in seconds), or (None, None) on failure
+    """
+    audio_path = generate_audio(content, title, language, voice_index)
+    if not audio_path:
+        logger.error(f"Audio generation failed for: {title}")
+        return None, None
+
+    return audio_path, get_audio_duration(audio_path)
@@ -7,11 +7,15 @@ import logging
 import hashlib
 import json
 import io
+import functools
+import queue
+import threading
+import numpy as np
 from num2words import num2words
 from config import (
     AUDIO_DIR, CACHE_DIR, AUDIO_COMPRESSION, 
     AUDIO_COMPRESSION_BITRATE, ELEVENLABS_API_KEY,
-    AUDIO_FORMATS, DEFAULT_AUDIO_FORMAT
+    AUDIO_FORMATS, DEFAULT_AUDIO_FORMAT, AUDIO_IO_BUFFER_SIZE
 )
 import edge_tts
 from gtts import gTTS
@@ -33,6 +37,14 @@ logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# NumPy dtype for each PCM sample width (bytes) that pydub produces
+_SAMPLE_DTYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+
+# Streamed synthesis: minimum characters per TTS request and crossfade (ms)
+# between consecutive chunks
+MIN_STREAM_CHUNK_CHARS = 300
+STREAM_CROSSFADE_MS = 200
+
 # Mapping of languages to Edge TTS voices with multiple options per language
 VOICE_MAPPING = {
     'fr': ["fr-FR-HenriNeural", "fr-FR-DeniseNeural", "fr-FR-BrigitteNeural", "fr-FR-AlainNeural", "fr-FR-EloiseNeural"],
@@ -85,7 +97,6 @@ class AudioEngine:
             
             if os.path.exists(output_file) and os.path.getsize(output_file) > 0:
                 logger.info(f"Edge TTS audio file generated: {output_file}")
-                time.sleep(1)  # Pause for file finalization
                 return True
             else:
                 logger.error(f"Edge TTS failed: No file generated at {output_file} or file is empty.")
@@ -113,7 +124,7 @@ class AudioEngine:
                 model="eleven_multilingual_v2"
             )
             
-            with open(output_file, "wb") as f:
+            with open(output_file, "wb", buffering=AUDIO_IO_BUFFER_SIZE) as f:
                 f.write(audio)
             
             if os.path.exists(output_file) and os.path.getsize(output_file) > 0:
@@ -395,10 +406,124 @@ def generate_audio(text, title, language='en', voice_index=0, premium=False, for
         logger.error(f"Critical error during audio generation: {str(e)}")
         return None
     
+def generate_audio_from_stream(text_chunks, language='en', voice_index=0, premium=False, format=DEFAULT_AUDIO_FORMAT):
+    """
+    Generate audio for text that is still being produced
+    
+    Chunks are grouped to at least MIN_STREAM_CHUNK_CHARS and handed through a
+    queue to a TTS worker thread, so synthesis of early text overlaps with
+    generation of later text. Chunk audio is joined with a short crossfade and
+    then enhanced/compressed like generate_audio.
+    
+    Args:
+        text_chunks (iterable): Text pieces in order (e.g. a SnippetStream)
+        language (str): Language code
+        voice_index (int): Index of voice to use
+        premium (bool): Whether to use premium voices
+        format (str): Audio format (mp3, ogg, wav)
+        
+    Returns:
+        str: Path to the generated audio file or None if generation failed
+    """
+    if format not in AUDIO_FORMATS:
+        format = DEFAULT_AUDIO_FORMAT
+    
+    chunk_queue = queue.Queue()
+    segments = []
+    failed = threading.Event()
+    
+    def synthesize_chunks():
+        engine = AudioEngine(language, voice_index, premium)
+        loop = asyncio.new_event_loop()
+        try:
+            while (text := chunk_queue.get()) is not None:
+                if failed.is_set():
+                    continue  # Drain the queue so the producer never blocks
+                
+                chunk_path = os.path.join(AUDIO_DIR, f"{uuid.uuid4()}.{format}")
+                try:
+                    cleaned_text = clean_text_for_tts(text, language)
+                    if loop.run_until_complete(engine.generate_audio(cleaned_text, chunk_path)):
+                        segments.append(AudioSegment.from_file(chunk_path))
+                    else:
+                        failed.set()
+                except Exception as e:
+                    logger.error(f"Error synthesizing streamed chunk: {e}")
+                    failed.set()
+                finally:
+                    if os.path.exists(chunk_path):
+                        os.remove(chunk_path)
+        finally:
+            loop.close()
+    
+    worker = threading.Thread(target=synthesize_chunks, daemon=True)
+    worker.start()
+    
+    try:
+        # Producer: group incoming text and dispatch it while more arrives
+        pending = ""
+        for text in text_chunks:
+            pending = f"{pending}\n{text}" if pending else text
+            if len(pending) >= MIN_STREAM_CHUNK_CHARS:
+                chunk_queue.put(pending)
+                pending = ""
+        
+        if pending.strip():
+            chunk_queue.put(pending)
+    except Exception as e:
+        # A source that dies partway leaves the audio incomplete
+        logger.error(f"Error reading streamed text: {e}")
+        failed.set()
+    finally:
+        chunk_queue.put(None)
+        worker.join()
+    
+    if failed.is_set() or not segments:
+        logger.error("Streamed audio generation failed.")
+        return None
+    
+    try:
+        # Join chunks with a crossfade no longer than either side
+        audio = segments[0]
+        for segment in segments[1:]:
+            audio = audio.append(segment, crossfade=min(STREAM_CROSSFADE_MS, len(audio), len(segment)))
+        
+        filepath = os.path.join(AUDIO_DIR, f"{uuid.uuid4()}.{format}")
+        audio.export(filepath, format=format)
+        
+        # Enhance audio quality
+        enhance_audio(filepath, normalize=True, add_fade=True)
+        
+        # Compress audio if enabled
+        if AUDIO_COMPRESSION:
+            compress_audio(filepath, bitrate=AUDIO_COMPRESSION_BITRATE)
+        
+        return filepath
+    
+    except Exception as e:
+        logger.error(f"Error assembling streamed audio: {str(e)}")
+        return None
+
+@functools.lru_cache(maxsize=1024)
+def _probe_audio_duration(filepath, mtime):
+    """Decode an audio file for its duration; mtime keys the cache to the file version"""
+    try:
+        # Try to get actual duration with pydub
+        audio = AudioSegment.from_file(filepath)
+        return audio.duration_seconds
+    except:
+        # Fallback to estimate based on file size
+        file_size_kb = os.path.getsize(filepath) / 1024
+        estimated_duration = file_size_kb / 10
+        return max(estimated_duration, 10)
+
 def get_audio_duration(filepath):
     """
     Get the duration of an audio file in seconds
     
+    Results are memoized per (path, mtime), so repeated lookups for the
+    same file (e.g. every AudioPlayer render) skip decoding it again.
+    
     Args:
         filepath (str): Path to the audio file
         
@@ -407,15 +532,7 @@ def get_audio_duration(filepath):
     """
     try:
         if os.path.exists(filepath):
-            # Try to get actual duration with pydub
-            try:
-                audio = AudioSegment.from_file(filepath)
-                return audio.duration_seconds
-            except:
-                # Fallback to estimate based on file size
-                file_size_kb = os.path.getsize(filepath) / 1024
-                estimated_duration = file_size_kb / 10
-                return max(estimated_duration, 10)
+            return _probe_audio_duration(filepath, os.path.getmtime(filepath))
     except Exception as e:
         logger.error(f"Error getting audio duration: {e}")
     
@@ -461,6 +578,12 @@ def convert_audio_format(input_path, output_format=DEFAULT_AUDIO_FORMAT):
         
     try:
         output_path = os.path.splitext(input_path)[0] + f".{output_format}"
+        
+        # Reuse an earlier conversion that is still newer than its source
+        if (os.path.exists(output_path) and
+                os.path.getmtime(output_path) >= os.path.getmtime(input_path)):
+            return output_path
+        
         audio = AudioSegment.from_file(input_path)
         audio.export(output_path, format=output_format)
         logger.info(f"Converted audio: {input_path} -> {output_path}")
@@ -469,10 +592,31 @@ def convert_audio_format(input_path, output_format=DEFAULT_AUDIO_FORMAT):
         logger.error(f"Error converting audio format: {e}")
         return input_path
 
+@functools.lru_cache(maxsize=256)
+def _compute_waveform_data(audio_path, mtime, num_points):
+    """Decode an audio file into peak amplitudes; mtime keys the cache to the file version"""
+    audio = AudioSegment.from_file(audio_path)
+    
+    # Get raw audio data as a flat integer array (no per-sample Python objects)
+    samples = np.frombuffer(audio.raw_data, dtype=_SAMPLE_DTYPES[audio.sample_width])
+    
+    # Peak amplitude per window, normalized by the sample width's full scale
+    window = len(samples) // num_points
+    if window == 0:
+        return (0.0,) * num_points
+    
+    peaks = np.abs(samples[:window * num_points].reshape(num_points, window).astype(np.int64)).max(axis=1)
+    full_scale = float(1 << (8 * audio.sample_width - 1))
+    
+    return tuple(np.minimum(peaks / full_scale, 1.0).tolist())
+
 def generate_waveform_data(audio_path, num_points=100):
     """
     Generate waveform data for visualization
     
+    Results are memoized per (path, mtime, num_points); failures are not
+    cached, so a file that could not be decoded is retried next time.
+    
     Args:
         audio_path (str): Path to audio file
         num_points (int): Number of data points to generate
@@ -481,24 +625,7 @@ def generate_waveform_data(audio_path, num_points=100):
         list: List of amplitude values for waveform visualization
     """
     try:
-        audio = AudioSegment.from_file(audio_path)
-        
-        # Get raw audio data
-        samples = audio.get_array_of_samples()
-        
-        # Calculate step size to get desired number of points
-        step = len(samples) // num_points
-        
-        # Extract sample points
-        waveform = []
-        for i in range(0, len(samples), step):
-            if len(waveform) >= num_points:
-                break
-            # Normalize to range between 0 and 1
-            value = abs(samples[i]) / 32767.0  # Assuming 16-bit audio
-            waveform.append(float(value))
-        
-        return waveform
+        return list(_compute_waveform_data(audio_path, os.path.getmtime(audio_path), num_points))
     except Exception as e:
         logger.error(f"Error generating waveform data: {e}")
         return [0] * num_points
@@ -0,0 +1,70 @@
+import logging
+from pathlib import Path
+import streamlit as st
+
+from utils.data_utils import UserSession
+from config import DEFAULT_LANGUAGE, DEFAULT_THEME
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Stylesheets shipped in static/css
+CSS_DIR = Path('static/css')
+BASE_CSS_PATH = CSS_DIR / 'base.css'
+CARDS_CSS_PATH = CSS_DIR / 'cards.css'
+
+@st.cache_data(show_spinner=False)
+def load_css(path: str, mtime: float) -> str:
+    """Read a stylesheet; mtime is part of the cache key so edits are picked up"""
+    return Path(path).read_text()
+
+def _read_stylesheet(path: Path) -> str:
+    """Return a stylesheet's contents, or an empty string if it is missing"""
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        logger.warning(f"Stylesheet not found: {path}")
+        return ""
+    return load_css(str(path), mtime)
+
+def init_session_state():
+    """
+    Initialize the session state variables shared by all pages
+    
+    Safe to call on every rerun: existing values are left untouched.
+    """
+    # Language setting
+    if 'language' not in st.session_state:
+        st.session_state.language = DEFAULT_LANGUAGE
+    
+    # Theme setting
+    if 'theme' not in st.session_state:
+        st.session_state.theme = DEFAULT_THEME
+        
+    # User session
+    if 'session' not in st.session_state:
+        st.session_state.session = UserSession()
+    
+    # Current page
+    if 'current_page' not in st.session_state:
+        st.session_state.current_page = 'home'
+    
+    # Playlist
+    if 'current_playlist' not in st.session_state:
+        st.session_state.current_playlist = []
+
+def inject_base_css(theme: str = DEFAULT_THEME):
+    """
+    Inject the base, card and theme stylesheets as a single element
+    
+    Card components only emit class-based markup and rely on this element
+    for their styles.
+    
+    Args:
+        theme (str): Theme name ('dark' or 'light')
+    """
+    theme_css_path = CSS_DIR / ('light.css' if theme == 'light' else 'dark.css')
+    css = "\n".join(
+        _read_stylesheet(path) for path in (BASE_CSS_PATH, CARDS_CSS_PATH, theme_css_path)
+    )
+    st.markdown(f'<style>{css}</style>', unsafe_allow_html=True)
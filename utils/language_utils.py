@@ -2,6 +2,7 @@ import os
 import yaml
 import logging
 import re
+import functools
 from typing import Dict, List, Any, Union, Optional
 from config import TRANSLATIONS_DIR, AVAILABLE_LANGUAGES, DEFAULT_LANGUAGE
 
@@ -53,10 +54,14 @@ def load_translations(language: str) -> Dict[str, str]:
         logger.error(f"Error loading translations for {language}: {e}")
         return {}
 
+@functools.lru_cache(maxsize=4096)
 def get_translation(key: str, language: str, default: Optional[str] = None) -> str:
     """
     Get translation for a key
     
+    Results are memoized per (key, language, default); call
+    ``get_translation.cache_clear()`` whenever translation files change.
+    
     Args:
         key (str): Translation key
         language (str): Language code
@@ -163,6 +168,7 @@ def create_empty_translation_file(language: str) -> bool:
         # Clear cache
         if language in _translations_cache:
             del _translations_cache[language]
+        get_translation.cache_clear()
         
         logger.info(f"Created empty translation file: {translation_path}")
         return True
@@ -232,6 +238,7 @@ def update_translation(language: str, key: str, value: str) -> bool:
         # Update cache
         if language in _translations_cache:
             _translations_cache[language][key] = value
+        get_translation.cache_clear()
         
         logger.info(f"Updated translation for {language}.{key}")
         return True
@@ -253,12 +260,13 @@ def is_rtl_language(language: str) -> bool:
     from config import RTL_LANGUAGES
     return language in RTL_LANGUAGES
 
+@functools.lru_cache(maxsize=1)
 def get_languages_for_display() -> Dict[str, str]:
     """
     Get languages for display in UI
     
     Returns:
-        dict: Dictionary of language codes and names
+        dict: Dictionary of language codes and names (shared, do not mutate)
     """
     return AVAILABLE_LANGUAGES
 
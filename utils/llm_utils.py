@@ -32,6 +32,12 @@ client = groq.Groq(api_key=GROQ_API_KEY)
 # Initialize LangChain components
 llm = ChatGroq(api_key=GROQ_API_KEY, model_name=LLM_MODELS["default"])
 
+# Bullet ("- item", "* item") or numbered ("1. item", "2) item") list line
+_LIST_ITEM_RE = re.compile(r'^[ \t]*(?:[-*]|\d+[.)])[ \t]+(.+?)[ \t]*$', re.MULTILINE)
+
+# Numbered items run together on one line ("1. foo 2. bar")
+_INLINE_NUMBERED_RE = re.compile(r'\d+\.\s*(.*?)(?=\d+\.|$)', re.DOTALL)
+
 # Download NLTK data if needed
 try:
     nltk.data.find('tokenizers/punkt')
@@ -173,9 +179,123 @@ class ContentGenerationManager:
             # If all fails, return error message
             return "Error generating content. Please try again later."
 
+    def stream_content(self, prompt, model=None, temperature=None, max_tokens=1500):
+        """
+        Stream generated content as it is produced (not cached)
+        
+        Args:
+            prompt (str): Prompt for the LLM
+            model (str, optional): Model to use
+            temperature (float, optional): Temperature parameter
+            max_tokens (int): Maximum tokens to generate
+            
+        Yields:
+            str: Text deltas in arrival order
+        """
+        if not model:
+            model = self.default_model
+            
+        if temperature is None:
+            temperature = self.temperature
+        
+        logger.info(f"Streaming content using model: {model}")
+        
+        stream = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+        )
+        
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
 # Create a singleton manager instance
 content_manager = ContentGenerationManager()
 
+def warm_up_connections():
+    """
+    Open the Groq client's pooled HTTPS connection ahead of the first request
+    
+    The module-level client keeps connections alive between calls; making a
+    cheap request at startup means the first snippet doesn't pay for DNS,
+    TCP and TLS setup. Blocking; run it on a background thread.
+    """
+    try:
+        client.models.list()
+        logger.info("LLM client connection warmed up")
+    except Exception as e:
+        logger.warning(f"LLM client warm-up failed: {e}")
+
+# Sentence end (., !, ?) followed by whitespace, or a paragraph break
+_SENTENCE_BOUNDARY_RE = re.compile(r'(?<=[.!?])\s+|\n{2,}')
+
+def _snippet_cache_key(topic, duration_minutes, language):
+    """Cache key shared by generate_learning_snippet and SnippetStream"""
+    topic_hash = hashlib.md5(topic.encode()).hexdigest()
+    return f"snippet_{topic_hash}_{language}_{duration_minutes}"
+
+def _build_snippet(content, topic, duration_minutes, language):
+    """Split generated content into title and body and wrap it in a snippet dict"""
+    lines = content.split('\n')
+    
+    # Extract title (first line that starts with #)
+    title_line = next((line for line in lines if line.strip().startswith('#')), None)
+    if title_line:
+        title = title_line.replace('#', '').strip()
+        # Remove title line from content
+        lines.remove(title_line)
+    else:
+        # If no title with # is found, use the first line
+        title = lines[0].strip()
+        lines.pop(0)
+    
+    body = '\n'.join(lines).strip()
+    
+    return {
+        "id": str(uuid.uuid4()),
+        "title": title,
+        "content": body,
+        "topic": topic,
+        "target_duration": duration_minutes,
+        "language": language,
+        "created_at": time.time(),
+        "created_date": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+    }
+
+def _error_snippet(topic, duration_minutes, language):
+    """Build the placeholder snippet returned when generation fails"""
+    # Multilingual error messages
+    error_messages = {
+        'fr': f"Nous n'avons pas pu générer de contenu pour {topic} en raison d'une erreur. Veuillez réessayer plus tard.",
+        'en': f"We couldn't generate content for {topic} due to an error. Please try again later.",
+        'es': f"No pudimos generar contenido para {topic} debido a un error. Por favor, inténtalo más tarde.",
+        'de': f"Wir konnten für {topic} aufgrund eines Fehlers keinen Inhalt generieren. Bitte versuchen Sie es später erneut.",
+        'it': f"Non abbiamo potuto generare contenuti per {topic} a causa di un errore. Per favore riprova più tardi.",
+        'ja': f"エラーのため、{topic}のコンテンツを生成できませんでした。後でもう一度お試しください。",
+        'zh': f"由于错误，我们无法为{topic}生成内容。请稍后再试。",
+        'ar': f"لم نتمكن من إنشاء محتوى لـ {topic} بسبب خطأ. يرجى المحاولة مرة أخرى لاحقًا."
+    }
+    
+    error_message = error_messages.get(language, error_messages['en'])
+    
+    return {
+        "id": str(uuid.uuid4()),
+        "title": f"Introduction to {topic}",
+        "content": error_message,
+        "topic": topic,
+        "target_duration": duration_minutes,
+        "language": language,
+        "error": True,
+        "created_at": time.time(),
+        "created_date": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+    }
+
 async def generate_learning_snippet(topic, duration_minutes=DEFAULT_SNIPPET_DURATION, language='en'):
     """
     Generate a learning snippet on a specific topic
@@ -192,9 +312,7 @@ async def generate_learning_snippet(topic, duration_minutes=DEFAULT_SNIPPET_DURA
     target_word_count = duration_minutes * WORDS_PER_MINUTE
     
     # Create cache key based on parameters
-    topic_hash = hashlib.md5(topic.encode()).hexdigest()
-    cache_key = f"snippet_{topic_hash}_{language}_{duration_minutes}"
-    cache_path = os.path.join(CACHE_DIR, f"{cache_key}.json")
+    cache_key = _snippet_cache_key(topic, duration_minutes, language)
     
     # Check if we have a cached version
     cached_snippet = content_manager._check_cache(cache_key)
@@ -218,32 +336,7 @@ async def generate_learning_snippet(topic, duration_minutes=DEFAULT_SNIPPET_DURA
         )
         
         # Parse content to get title and body
-        lines = content.split('\n')
-        
-        # Extract title (first line that starts with #)
-        title_line = next((line for line in lines if line.strip().startswith('#')), None)
-        if title_line:
-            title = title_line.replace('#', '').strip()
-            # Remove title line from content
-            lines.remove(title_line)
-        else:
-            # If no title with # is found, use the first line
-            title = lines[0].strip()
-            lines.pop(0)
-        
-        body = '\n'.join(lines).strip()
-        
-        # Create snippet object
-        snippet = {
-            "id": str(uuid.uuid4()),
-            "title": title,
-            "content": body,
-            "topic": topic,
-            "target_duration": duration_minutes,
-            "language": language,
-            "created_at": time.time(),
-            "created_date": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-        }
+        snippet = _build_snippet(content, topic, duration_minutes, language)
         
         # Cache the snippet
         content_manager._save_cache(cache_key, snippet)
@@ -253,32 +346,63 @@ async def generate_learning_snippet(topic, duration_minutes=DEFAULT_SNIPPET_DURA
     except Exception as e:
         logger.error(f"Error generating content: {e}")
         
-        # Multilingual error messages
-        error_messages = {
-            'fr': f"Nous n'avons pas pu générer de contenu pour {topic} en raison d'une erreur. Veuillez réessayer plus tard.",
-            'en': f"We couldn't generate content for {topic} due to an error. Please try again later.",
-            'es': f"No pudimos generar contenido para {topic} debido a un error. Por favor, inténtalo más tarde.",
-            'de': f"Wir konnten für {topic} aufgrund eines Fehlers keinen Inhalt generieren. Bitte versuchen Sie es später erneut.",
-            'it': f"Non abbiamo potuto generare contenuti per {topic} a causa di un errore. Per favore riprova più tardi.",
-            'ja': f"エラーのため、{topic}のコンテンツを生成できませんでした。後でもう一度お試しください。",
-            'zh': f"由于错误，我们无法为{topic}生成内容。请稍后再试。",
-            'ar': f"لم نتمكن من إنشاء محتوى لـ {topic} بسبب خطأ. يرجى المحاولة مرة أخرى لاحقًا."
-        }
+        # Return error snippet
+        return _error_snippet(topic, duration_minutes, language)
+
+class SnippetStream:
+    """
+    Generate a learning snippet while yielding its text sentence by sentence
+    
+    Iterating streams the LLM response and yields each completed sentence or
+    paragraph, so work such as TTS can start before the full text exists.
+    After iteration, `snippet` holds the same dict generate_learning_snippet
+    would return (and it is cached the same way). A cached snippet is loaded
+    up front: `cached` is True and iteration yields nothing.
+    """
+    
+    def __init__(self, topic, duration_minutes=DEFAULT_SNIPPET_DURATION, language='en'):
+        self.topic = topic
+        self.duration_minutes = duration_minutes
+        self.language = language
+        self.cache_key = _snippet_cache_key(topic, duration_minutes, language)
+        self.snippet = content_manager._check_cache(self.cache_key)
+        self.cached = self.snippet is not None
+    
+    def __iter__(self):
+        if self.cached:
+            return
         
-        error_message = error_messages.get(language, error_messages['en'])
+        prompt = get_learning_prompt(self.topic, self.duration_minutes * WORDS_PER_MINUTE, self.language)
+        parts = []
+        pending = ""
         
-        # Return error snippet
-        return {
-            "id": str(uuid.uuid4()),
-            "title": f"Introduction to {topic}",
-            "content": error_message,
-            "topic": topic,
-            "target_duration": duration_minutes,
-            "language": language,
-            "error": True,
-            "created_at": time.time(),
-            "created_date": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-        }
+        try:
+            logger.info(f"Streaming snippet for topic: {self.topic}, language: {self.language}, duration: {self.duration_minutes}mins")
+            
+            for delta in content_manager.stream_content(
+                prompt=prompt,
+                model=LLM_MODELS["generation"],
+                temperature=0.7,
+                max_tokens=2000
+            ):
+                parts.append(delta)
+                
+                # Yield every completed sentence; keep the unfinished tail
+                *sentences, pending = _SENTENCE_BOUNDARY_RE.split(pending + delta)
+                for sentence in sentences:
+                    if sentence.strip():
+                        yield sentence
+            
+            if pending.strip():
+                yield pending
+        
+        except Exception as e:
+            logger.error(f"Error streaming content: {e}")
+            self.snippet = _error_snippet(self.topic, self.duration_minutes, self.language)
+            return
+        
+        self.snippet = _build_snippet(''.join(parts), self.topic, self.duration_minutes, self.language)
+        content_manager._save_cache(self.cache_key, self.snippet)
 
 async def generate_recommendation(previous_topics, count=3, language='en'):
     """
@@ -313,22 +437,20 @@ async def generate_recommendation(previous_topics, count=3, language='en'):
             max_tokens=500
         )
         
-        # Parse recommendations
-        recommendations = []
-        for line in content.split('\n'):
-            line = line.strip()
-            if line.startswith('- ') or line.startswith('* '):
-                recommendations.append(line[2:].strip())
+        # Parse recommendations (dict keeps first-seen order and drops repeats)
+        recommendations = dict.fromkeys(_LIST_ITEM_RE.findall(content))
         
         # If we don't have enough recommendations, try an alternative approach
         if len(recommendations) < count:
-            import re
             # Try to find points in the text that might be topics
-            additional_lines = re.findall(r'\d+\.\s*(.*?)(?=\d+\.|$)', content, re.DOTALL)
-            for line in additional_lines:
+            for line in _INLINE_NUMBERED_RE.findall(content):
                 line = line.strip()
-                if line and len(recommendations) < count:
-                    recommendations.append(line)
+                if line:
+                    recommendations.setdefault(line)
+                    if len(recommendations) >= count:
+                        break
+        
+        recommendations = list(recommendations)
         
         # Ensure we return the requested number of recommendations (or fewer if not enough)
         recommendations = recommendations[:count]
@@ -0,0 +1,30 @@
+import streamlit as st
+
+# st.fragment (>=1.37) was introduced as st.experimental_fragment (1.33);
+# older releases have neither and fall back to full-script reruns
+_fragment_impl = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+FRAGMENTS_SUPPORTED = _fragment_impl is not None
+
+def fragment(func=None, *, run_every=None):
+    """
+    Decorator marking a function as a Streamlit fragment
+
+    Widget interactions inside a fragment only rerun the fragment instead of
+    the whole script. On Streamlit versions without fragment support the
+    function is returned unchanged.
+
+    Args:
+        func (callable, optional): Function to decorate
+        run_every (int | float | str, optional): Auto-rerun interval
+
+    Returns:
+        callable: Decorated function (or decorator if func is None)
+    """
+    if not FRAGMENTS_SUPPORTED:
+        if func is None:
+            return lambda f: f
+        return func
+
+    if func is None:
+        return _fragment_impl(run_every=run_every)
+    return _fragment_impl(func, run_every=run_every)